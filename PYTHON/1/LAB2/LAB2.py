@@ -1,53 +1,208 @@
-from typing import List, Tuple
+import sys
+from bisect import bisect_left
+from itertools import islice
+from typing import TYPE_CHECKING, Sequence, Tuple
 
+if TYPE_CHECKING:
+    import numpy as np
 
-def guess_number(target: int, numbers_range: List[int], method: str = "binary") -> Tuple[int, int]:
+
+# Методы поиска и их названия для вывода
+METHODS = {
+    "binary": "бинарный",
+    "linear": "линейный",
+    "interpolation": "интерполяционный",
+    "exponential": "экспоненциальный",
+    "fibonacci": "Фибоначчи",
+    "auto": "автоматический",
+}
+
+
+def guess_number(target: int, numbers_range: Sequence[int], method: str = "binary") -> Tuple[int, int]:
     """
     Угадывает число в заданном диапазоне с использованием указанного метода.
 
     Args:
         target (int): Число, которое нужно угадать
-        numbers_range (List[int]): Диапазон чисел для поиска
-        method (str): Метод угадывания - "binary" или "linear"
+        numbers_range (Sequence[int]): Диапазон чисел для поиска - список,
+            range или другая последовательность с индексированием
+        method (str): Метод угадывания - "binary", "linear", "interpolation",
+            "exponential", "fibonacci" или "auto" (выбор по диапазону и числу)
 
     Returns:
         Tuple[int, int]: Кортеж (угаданное_число, количество_попыток)
 
     Raises:
         ValueError: Если target не входит в диапазон
+
+    Для range проверки выполняются за O(1) и без копирования, поэтому
+    поиск в range(10**9) занимает микросекунды. Все методы, кроме
+    линейного, требуют отсортированного диапазона.
     """
-    if not numbers_range:
+    if len(numbers_range) == 0:
         raise ValueError("Диапазон чисел не может быть пустым")
 
-    if target not in numbers_range:
-        raise ValueError(f"Число {target} не входит в диапазон")
-
     # Автоматически исправляем неверный метод (пусть будет бинарный по умолчанию)
-    if method not in ["binary", "linear"]:
+    if method not in METHODS:
         method = "binary"
 
-    if method == "binary" and numbers_range != sorted(numbers_range):
+    is_sorted = method != "linear" and _is_sorted(numbers_range)
+
+    if not _contains(target, numbers_range, is_sorted):
+        raise ValueError(f"Число {target} не входит в диапазон")
+
+    if method == "auto":
+        method = _choose_method(target, numbers_range, is_sorted)
+
+    if method != "linear" and not is_sorted:
+        if method == "binary":
+            raise ValueError("Для бинарного поиска диапазон должен быть отсортирован")
+        raise ValueError(f"Для метода {method} диапазон должен быть отсортирован")
+
+    return _SEARCHES[method](target, numbers_range)
+
+
+def _choose_method(target: int, numbers: Sequence[int], is_sorted: bool) -> str:
+    """
+    Выбирает метод по дешевым признакам диапазона.
+
+    Неотсортированный диапазон - линейный поиск; range (равномерный шаг) -
+    интерполяционный, он находит число за одну попытку; если по крайним
+    значениям число ожидается в начале - экспоненциальный; иначе бинарный.
+    """
+    if not is_sorted:
+        return "linear"
+    if isinstance(numbers, range):
+        return "interpolation"
+
+    first, last = numbers[0], numbers[-1]
+    if last > first:
+        expected = (target - first) * (len(numbers) - 1) / (last - first)
+        if expected < len(numbers).bit_length():
+            return "exponential"
+    return "binary"
+
+
+def guess_numbers(targets: Sequence[int], numbers_range: Sequence[int]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Угадывает сразу много чисел бинарным поиском в одном диапазоне.
+
+    Args:
+        targets (Sequence[int]): Числа, которые нужно угадать
+        numbers_range (Sequence[int]): Отсортированный диапазон - список,
+            range или массив NumPy
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (угаданные_числа, количество_попыток),
+        попытки для каждого числа те же, что у guess_number(..., "binary")
+
+    Raises:
+        ValueError: Если диапазон пуст, не отсортирован или какое-то
+            число не входит в диапазон
+
+    Диапазон проверяется один раз на все числа, а поиск идет одновременно
+    для всех чисел: шагов столько же, сколько у одного бинарного поиска,
+    каждый шаг - операции над массивами. range не превращается в список.
+    NumPy импортируется только здесь, чтобы не замедлять импорт модуля.
+    """
+    import numpy as np
+
+    size = len(numbers_range)
+    if size == 0:
+        raise ValueError("Диапазон чисел не может быть пустым")
+
+    if not _is_sorted(numbers_range):
         raise ValueError("Для бинарного поиска диапазон должен быть отсортирован")
 
-    if method == "binary":
-        return _binary_search(target, numbers_range)
+    targets = np.asarray(targets)
+    if isinstance(numbers_range, range):
+        start, step = numbers_range.start, numbers_range.step
+        # Границы берутся по значениям: у range из одного числа шаг может быть отрицательным
+        present = ((targets >= numbers_range[0]) & (targets <= numbers_range[-1])
+                   & ((targets - start) % step == 0))
+
+        def value_at(index):
+            return start + index * step
     else:
-        return _linear_search(target, numbers_range)
+        values = np.asarray(numbers_range)
+        index = np.minimum(np.searchsorted(values, targets), size - 1)
+        present = values[index] == targets
+
+        def value_at(index):
+            return values[index]
+
+    if not present.all():
+        missing = targets[~present].flat[0]
+        raise ValueError(f"Число {missing} не входит в диапазон")
+
+    # Тот же цикл, что в _binary_search, но по всем числам сразу
+    attempts = np.zeros(targets.shape, dtype=np.int64)
+    left = np.zeros(targets.shape, dtype=np.int64)
+    right = np.full(targets.shape, size - 1, dtype=np.int64)
+    active = np.ones(targets.shape, dtype=bool)
+
+    while active.any():
+        attempts += active
+        mid = (left + right) // 2
+        guess = value_at(mid)
+
+        active &= guess != targets
+        go_right = active & (guess < targets)
+        np.copyto(left, mid + 1, where=go_right)
+        np.copyto(right, mid - 1, where=active & ~go_right)
+
+    return targets.copy(), attempts
+
+
+def _is_sorted(numbers: Sequence[int]) -> bool:
+    """
+    Проверяет, что последовательность не убывает.
+
+    Для range - O(1) по шагу, для массива NumPy - векторно,
+    для остальных - один проход без копии.
+    """
+    if isinstance(numbers, range):
+        return numbers.step > 0 or len(numbers) <= 1
+    # Массив NumPy может прийти, только если numpy уже импортирован
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(numbers, np.ndarray):
+        return bool(np.all(numbers[1:] >= numbers[:-1]))
+    return all(a <= b for a, b in zip(numbers, islice(numbers, 1, None)))
+
+
+def _contains(target: int, numbers: Sequence[int], is_sorted: bool) -> bool:
+    """
+    Проверяет, что target есть в последовательности.
+
+    Для range - O(1), для отсортированной последовательности - бинарный
+    поиск O(log n), иначе - обычный проход.
+    """
+    if is_sorted and not isinstance(numbers, range):
+        try:
+            index = bisect_left(numbers, target)
+        except TypeError:
+            return False
+        return index < len(numbers) and numbers[index] == target
+    return target in numbers
 
 
-def _binary_search(target: int, numbers: List[int]) -> Tuple[int, int]:
+def _binary_search(target: int, numbers: Sequence[int]) -> Tuple[int, int]:
     """
     Реализация бинарного поиска для угадывания числа.
 
     Args:
         target (int): Число для поиска
-        numbers (List[int]): Отсортированный список чисел
+        numbers (Sequence[int]): Отсортированная последовательность чисел
 
     Returns:
         Tuple[int, int]: (найденное_число, количество_попыток)
     """
+    return _binary_search_between(target, numbers, 0, len(numbers) - 1)
+
+
+def _binary_search_between(target: int, numbers: Sequence[int], left: int, right: int) -> Tuple[int, int]:
+    """Бинарный поиск на отрезке индексов [left, right]."""
     attempts = 0
-    left, right = 0, len(numbers) - 1
 
     while left <= right:
         attempts += 1
@@ -65,13 +220,131 @@ def _binary_search(target: int, numbers: List[int]) -> Tuple[int, int]:
     raise RuntimeError("Алгоритм бинарного поиска не нашел число, хотя оно должно быть в диапазоне")
 
 
-def _linear_search(target: int, numbers: List[int]) -> Tuple[int, int]:
+def _interpolation_search(target: int, numbers: Sequence[int]) -> Tuple[int, int]:
+    """
+    Интерполяционный поиск: следующая догадка - там, где число стояло бы
+    при равномерном распределении значений между границами отрезка.
+
+    O(log log n) попыток на равномерных данных, O(n) в худшем случае.
+
+    Args:
+        target (int): Число для поиска
+        numbers (Sequence[int]): Отсортированная последовательность чисел
+
+    Returns:
+        Tuple[int, int]: (найденное_число, количество_попыток)
+    """
+    attempts = 0
+    left, right = 0, len(numbers) - 1
+
+    while left <= right and numbers[left] <= target <= numbers[right]:
+        attempts += 1
+        low, high = numbers[left], numbers[right]
+        if high == low:
+            mid = left
+        else:
+            mid = left + int((target - low) * (right - left) // (high - low))
+        guess = numbers[mid]
+
+        if guess == target:
+            return guess, attempts
+        elif guess < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+
+    # Эта точка недостижима благодаря проверкам в guess_number, но пусть будет
+    raise RuntimeError("Алгоритм интерполяционного поиска не нашел число, хотя оно должно быть в диапазоне")
+
+
+def _exponential_search(target: int, numbers: Sequence[int]) -> Tuple[int, int]:
+    """
+    Экспоненциальный (галопирующий) поиск: проверяет индексы 0, 1, 2, 4, 8, ...
+    до первого значения не меньше target, затем бинарный поиск внутри отрезка.
+
+    O(log i) попыток, где i - позиция числа, поэтому быстр для чисел в начале.
+
+    Args:
+        target (int): Число для поиска
+        numbers (Sequence[int]): Отсортированная последовательность чисел
+
+    Returns:
+        Tuple[int, int]: (найденное_число, количество_попыток)
+    """
+    attempts = 1
+    if numbers[0] == target:
+        return numbers[0], attempts
+
+    bound = 1
+    while bound < len(numbers):
+        attempts += 1
+        guess = numbers[bound]
+        if guess == target:
+            return guess, attempts
+        if guess > target:
+            break
+        bound *= 2
+
+    found, more = _binary_search_between(target, numbers, bound // 2 + 1, min(bound, len(numbers)) - 1)
+    return found, attempts + more
+
+
+def _fibonacci_search(target: int, numbers: Sequence[int]) -> Tuple[int, int]:
+    """
+    Поиск Фибоначчи: отрезок делится в отношении соседних чисел Фибоначчи,
+    индексы считаются только сложением и вычитанием.
+
+    O(log n) попыток, как у бинарного поиска.
+
+    Args:
+        target (int): Число для поиска
+        numbers (Sequence[int]): Отсортированная последовательность чисел
+
+    Returns:
+        Tuple[int, int]: (найденное_число, количество_попыток)
+    """
+    attempts = 0
+    size = len(numbers)
+
+    # Наименьшее число Фибоначчи fib >= size и два предыдущих
+    fib_2, fib_1 = 0, 1
+    fib = 1
+    while fib < size:
+        fib_2, fib_1 = fib_1, fib
+        fib = fib_1 + fib_2
+
+    offset = -1
+    while fib > 1:
+        attempts += 1
+        index = min(offset + fib_2, size - 1)
+        guess = numbers[index]
+
+        if guess == target:
+            return guess, attempts
+        elif guess < target:
+            fib, fib_1 = fib_1, fib_2
+            fib_2 = fib - fib_1
+            offset = index
+        else:
+            fib, fib_1 = fib_2, fib_1 - fib_2
+            fib_2 = fib - fib_1
+
+    if fib_1 and offset + 1 < size:
+        attempts += 1
+        if numbers[offset + 1] == target:
+            return numbers[offset + 1], attempts
+
+    # Эта точка недостижима благодаря проверкам в guess_number, но пусть будет
+    raise RuntimeError("Алгоритм поиска Фибоначчи не нашел число, хотя оно должно быть в диапазоне")
+
+
+def _linear_search(target: int, numbers: Sequence[int]) -> Tuple[int, int]:
     """
     Реализация линейного поиска для угадывания числа.
 
     Args:
         target (int): Число для поиска
-        numbers (List[int]): Список чисел
+        numbers (Sequence[int]): Последовательность чисел
 
     Returns:
         Tuple[int, int]: (найденное_число, количество_попыток)
@@ -87,12 +360,21 @@ def _linear_search(target: int, numbers: List[int]) -> Tuple[int, int]:
     raise RuntimeError("Алгоритм линейного поиска не нашел число, хотя оно должно быть в диапазоне")
 
 
-def input_helper() -> Tuple[int, List[int], str]:
+_SEARCHES = {
+    "binary": _binary_search,
+    "linear": _linear_search,
+    "interpolation": _interpolation_search,
+    "exponential": _exponential_search,
+    "fibonacci": _fibonacci_search,
+}
+
+
+def input_helper() -> Tuple[int, range, str]:
     """
     Вспомогательная функция для ввода данных с клавиатуры.
 
     Returns:
-        Tuple[int, List[int], str]: (target, numbers_range, method)
+        Tuple[int, range, str]: (target, numbers_range, method)
 
     Raises:
         ValueError: Если диапазон некорректен
@@ -106,18 +388,17 @@ def input_helper() -> Tuple[int, List[int], str]:
             raise ValueError("Начало диапазона не может быть больше конца")
 
         target = int(input("Введите число для угадывания: "))
-        method_input = input("Выберите метод (бинарный/линейный): ").strip().lower()
+        method_input = input(f"Выберите метод ({'/'.join(METHODS.values())}): ").strip().lower()
 
         # Преобразование метода
-        if method_input == "бинарный":
-            method = "binary"
-        elif method_input == "линейный":
-            method = "linear"
+        for method, method_name in METHODS.items():
+            if method_input == method_name.lower():
+                break
         else:
             print("Неверный метод, используется бинарный по умолчанию")
             method = "binary"
 
-        numbers_range = list(range(start, end + 1))
+        numbers_range = range(start, end + 1)
 
         # Дополнительная проверка, что наш target в диапазоне
         if target < start or target > end:
@@ -142,8 +423,7 @@ def main():
         print(f"Загаданное число: {result}")
         print(f"Количество попыток: {attempts}")
 
-        method_name = "бинарный" if method == "binary" else "линейный"
-        print(f"Использованный метод: {method_name}")
+        print(f"Использованный метод: {METHODS[method]}")
 
     except ValueError as e:
         print(f"Ошибка: {e}")
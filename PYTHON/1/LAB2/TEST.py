@@ -1,5 +1,10 @@
-from LAB2 import guess_number
+from LAB2 import guess_number, guess_numbers, _binary_search, METHODS
+import os
+import sys
+import subprocess
 import unittest
+import numpy as np
+import bench_guess
 
 
 class TestGuessNumber(unittest.TestCase):
@@ -58,5 +63,139 @@ class TestGuessNumber(unittest.TestCase):
         with self.assertRaises(ValueError):
             guess_number(5, unsorted_range, "binary")
 
+    def test_range_object(self):
+        """Тест с объектом range вместо списка"""
+        result, attempts = guess_number(42, range(1, 101), "binary")
+        self.assertEqual((result, attempts), guess_number(42, self.numbers, "binary"))
+        self.assertEqual(guess_number(42, range(1, 101), "linear"), (42, 42))
+
+    def test_huge_range(self):
+        """Тест с огромным range - без построения списка"""
+        result, attempts = guess_number(123456789, range(10 ** 9), "binary")
+        self.assertEqual(result, 123456789)
+        self.assertLessEqual(attempts, 30)
+        with self.assertRaises(ValueError):
+            guess_number(10 ** 9, range(10 ** 9), "binary")
+
+    def test_descending_range_binary(self):
+        """Тест бинарного поиска с убывающим range"""
+        with self.assertRaises(ValueError):
+            guess_number(5, range(10, 0, -1), "binary")
+
+    def test_tuple_sequence(self):
+        """Тест с отсортированным кортежем"""
+        result, attempts = guess_number(8, (1, 3, 5, 8, 13), "binary")
+        self.assertEqual(result, 8)
+        with self.assertRaises(ValueError):
+            guess_number(4, (1, 3, 5, 8, 13), "binary")
+
+class TestSearchMethods(unittest.TestCase):
+    """Тесты интерполяционного, экспоненциального поиска, поиска Фибоначчи и метода auto"""
+
+    def test_all_methods_find_every_number(self):
+        """Каждый метод находит каждое число в разных диапазонах"""
+        for size in range(1, 40):
+            for numbers in (list(range(size)), [i * i for i in range(size)],
+                            sorted([i // 3 for i in range(size)]), range(5, 5 + 3 * size, 3)):
+                for target in set(numbers):
+                    for method in METHODS:
+                        result, attempts = guess_number(target, numbers, method)
+                        self.assertEqual(result, target, (method, numbers, target))
+                        self.assertGreater(attempts, 0)
+
+    def test_interpolation_on_range(self):
+        """Интерполяционный поиск в равномерном range - одна попытка"""
+        self.assertEqual(guess_number(123456789, range(10 ** 9), "interpolation"), (123456789, 1))
+
+    def test_exponential_near_start(self):
+        """Экспоненциальный поиск быстр для чисел в начале"""
+        numbers = range(10 ** 9)
+        _, exponential = guess_number(5, numbers, "exponential")
+        _, binary = guess_number(5, numbers, "binary")
+        self.assertLess(exponential, 10)
+        self.assertLess(exponential, binary)
+
+    def test_sorted_required(self):
+        """Новым методам нужен отсортированный диапазон"""
+        for method in ("interpolation", "exponential", "fibonacci"):
+            with self.assertRaises(ValueError):
+                guess_number(5, [5, 2, 8, 1, 9], method)
+
+    def test_auto(self):
+        """Метод "auto" подходит и для несортированного диапазона"""
+        self.assertEqual(guess_number(8, [5, 2, 8, 1, 9], "auto"), (8, 3))
+        self.assertEqual(guess_number(42, range(1, 101), "auto"), (42, 1))
+        self.assertEqual(guess_number(3, [1, 2, 3, 100, 1000, 5000], "auto"), (3, 3))
+
+
+class TestGuessNumbers(unittest.TestCase):
+    """Тесты для пакетной функции guess_numbers"""
+
+    def test_attempts_match_binary_search(self):
+        """Попытки совпадают с _binary_search для каждого числа"""
+        numbers = list(range(1, 101))
+        found, attempts = guess_numbers(numbers, range(1, 101))
+        self.assertEqual(found.tolist(), numbers)
+        self.assertEqual(attempts.tolist(), [_binary_search(t, numbers)[1] for t in numbers])
+
+    def test_list_with_duplicates(self):
+        """Тест со списком с повторами"""
+        numbers = [1, 1, 2, 2, 2, 5, 9, 9]
+        found, attempts = guess_numbers(numbers, numbers)
+        self.assertEqual(attempts.tolist(), [_binary_search(t, numbers)[1] for t in numbers])
+
+    def test_range_with_step(self):
+        """Тест с range с шагом, без построения списка"""
+        numbers = range(3, 10 ** 9, 7)
+        targets = np.array([3, 703, numbers[-1]])
+        found, attempts = guess_numbers(targets, numbers)
+        self.assertEqual(found.tolist(), targets.tolist())
+        self.assertEqual(attempts[1], guess_number(703, numbers, "binary")[1])
+
+    def test_single_value_range_with_negative_step(self):
+        """range из одного числа с отрицательным шагом - как у guess_number"""
+        numbers = range(5, 4, -1)
+        found, attempts = guess_numbers([5], numbers)
+        self.assertEqual((found.tolist(), attempts.tolist()), ([5], [1]))
+        self.assertEqual(guess_number(5, numbers), (5, 1))
+        with self.assertRaises(ValueError):
+            guess_numbers([4], numbers)
+
+    def test_import_does_not_load_numpy(self):
+        """Импорт LAB2 не тянет NumPy - он нужен только guess_numbers"""
+        code = "import sys, LAB2; print('numpy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+    def test_invalid_input(self):
+        """Тест с числом вне диапазона, пустым и несортированным диапазоном"""
+        with self.assertRaises(ValueError):
+            guess_numbers([1, 150], range(1, 101))
+        with self.assertRaises(ValueError):
+            guess_numbers([4], range(1, 10, 2))
+        with self.assertRaises(ValueError):
+            guess_numbers([1], [])
+        with self.assertRaises(ValueError):
+            guess_numbers([5], [5, 2, 8])
+
+
+class TestBenchGuess(unittest.TestCase):
+    """Тест бенчмарка методов поиска"""
+
+    def test_run(self):
+        """Все сочетания параметров, ограничения размера списка и линейного поиска"""
+        results = bench_guess.run([10, 1000], ["binary", "linear"], ["range", "list"],
+                                  repeat=1, max_list=100, max_linear=100)
+        combos = {(r["function"], r["container"], r["size"]) for r in results}
+        self.assertIn(("_binary_search", "range", 1000), combos)
+        self.assertNotIn(("guess_number", "list", 1000), combos)
+        self.assertFalse([r for r in results if r["method"] == "linear" and r["size"] > 100])
+        for row in results:
+            self.assertEqual(guess_number(row["target"], range(1, row["size"] + 1), row["method"])[1],
+                             row["attempts"])
+            self.assertGreaterEqual(row["peak_bytes"], 0)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
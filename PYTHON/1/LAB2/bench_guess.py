@@ -0,0 +1,149 @@
+"""
+Бенчмарк guess_number и алгоритмов поиска на разных размерах диапазона.
+
+Для каждого размера (10, 100, ..., 10^8), вида диапазона (range и список),
+положения числа (начало, середина, конец, случайное) и метода замеряются
+время, число попыток и пиковая память (tracemalloc). Отдельно меряются
+сами алгоритмы (_binary_search, _linear_search, ...) без проверок
+guess_number — разница показывает стоимость проверок.
+
+Список и линейный поиск на больших размерах слишком медленные и
+прожорливые, поэтому для них есть отдельные ограничения размера.
+
+Результаты пишутся в JSON, чтобы сравнивать версии:
+    python bench_guess.py --max-size 100000000 --output bench_guess.json
+"""
+import gc
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+import tracemalloc
+from typing import Any, Callable, Dict, List, Sequence
+
+from LAB2 import guess_number, METHODS, _SEARCHES
+
+POSITIONS = ("start", "middle", "end", "random")
+
+
+def make_target(numbers: Sequence[int], position: str, rng: random.Random) -> int:
+    """Число в заданном положении диапазона."""
+    index = {
+        "start": 0,
+        "middle": (len(numbers) - 1) // 2,
+        "end": len(numbers) - 1,
+    }.get(position)
+    if index is None:
+        index = rng.randrange(len(numbers))
+    return numbers[index]
+
+
+def measure(call: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Медиана и минимум времени вызова, попытки и пик памяти."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        times.append(time.perf_counter() - started)
+
+    # Память меряется отдельным вызовом: tracemalloc замедляет код
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "attempts": result[1],
+        "peak_bytes": peak,
+    }
+
+
+def run(sizes: List[int], methods: List[str], containers: List[str],
+        repeat: int = 5, max_list: int = 10 ** 6, max_linear: int = 10 ** 6,
+        seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Прогоняет все сочетания параметров и возвращает по словарю на замер:
+    function, method, container, size, position, target и метрики measure().
+    """
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        for container in containers:
+            if container == "list" and size > max_list:
+                continue
+            numbers = range(1, size + 1) if container == "range" else list(range(1, size + 1))
+
+            for position in POSITIONS:
+                target = make_target(numbers, position, rng)
+                for method in methods:
+                    if method == "linear" and size > max_linear:
+                        continue
+
+                    calls = {"guess_number": lambda: guess_number(target, numbers, method)}
+                    if method in _SEARCHES:
+                        search = _SEARCHES[method]
+                        calls[search.__name__] = lambda: search(target, numbers)
+
+                    for function, call in calls.items():
+                        row = {"function": function, "method": method, "container": container,
+                               "size": size, "position": position, "target": target}
+                        row.update(measure(call, repeat))
+                        results.append(row)
+            del numbers
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк методов guess_number")
+    parser.add_argument("--max-size", type=int, default=10 ** 8,
+                        help="наибольший размер диапазона (размеры - степени 10 от 10)")
+    parser.add_argument("--methods", nargs="*", default=list(METHODS), choices=list(METHODS))
+    parser.add_argument("--containers", nargs="*", default=["range", "list"], choices=["range", "list"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-list", type=int, default=10 ** 6,
+                        help="наибольший размер для списка (он строится в памяти)")
+    parser.add_argument("--max-linear", type=int, default=10 ** 6,
+                        help="наибольший размер для линейного поиска")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_guess.json")
+    args = parser.parse_args()
+
+    sizes = []
+    size = 10
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 10
+
+    results = run(sizes, args.methods, args.containers, args.repeat,
+                  args.max_list, args.max_linear, args.seed)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+
+    print(f"{'функция':<22} {'метод':<14} {'вид':<6} {'размер':>10} {'положение':<7} "
+          f"{'медиана, мкс':>13} {'попыток':>8} {'память, КБ':>11}")
+    for row in results:
+        print(f"{row['function']:<22} {row['method']:<14} {row['container']:<6} {row['size']:>10} "
+              f"{row['position']:<7} {row['median_s'] * 1e6:>13.1f} {row['attempts']:>8} "
+              f"{row['peak_bytes'] / 1024:>11.1f}")
+
+    print(f"\nРезультаты записаны в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
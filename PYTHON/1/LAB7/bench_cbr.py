@@ -0,0 +1,127 @@
+"""
+Бенчмарк клиента курсов ЦБ на локальной замене API (cbr_stub_server).
+
+Сценарии:
+    cold        — get_currencies без кэша и пула: новое соединение на каждый вызов
+    warm_client — через CbrClient (keep-alive)
+    conditional — CbrClient + ValidatorStore (ответы 304)
+    warm_cache  — через RatesCache (сеть только на первом вызове)
+    concurrent  — несколько потоков через общий CbrClient
+
+Запуск:
+    python bench_cbr.py --calls 500 --latency 0.002 --threads 8 --json bench.json
+"""
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from cbr_rates import get_currencies
+from cbr_client import CbrClient
+from rates_cache import RatesCache, ValidatorStore
+from cbr_stub_server import CbrStubServer
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(call: Callable[[], object], calls: int, threads: int = 1) -> Dict[str, float]:
+    """
+    Выполняет call() calls раз в threads потоках.
+
+    Возвращает вызовы в секунду, p50/p99/среднюю задержку в миллисекундах
+    и число вызовов, завершившихся исключением.
+    """
+    latencies: List[float] = []
+    errors: List[Exception] = []  # list.append атомарен, в отличие от счётчика += 1
+
+    def one(_) -> None:
+        started = time.perf_counter()
+        try:
+            call()
+        except (ConnectionError, ValueError, KeyError, TypeError) as exc:
+            errors.append(exc)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    if threads == 1:
+        for i in range(calls):
+            one(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "calls": calls,
+        "threads": threads,
+        "calls_per_sec": calls / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "errors": len(errors),
+    }
+
+
+def run(calls: int = 200, threads: int = 8, **server_options) -> Dict[str, Dict[str, float]]:
+    """Прогоняет все сценарии на свежем CbrStubServer и возвращает результаты."""
+    codes = ["USD", "EUR"]
+    results = {}
+
+    with CbrStubServer(**server_options) as server:
+        url = server.url
+
+        results["cold"] = measure(lambda: get_currencies(codes, url=url), calls)
+
+        with CbrClient(pool_size=threads, retries=0) as client:
+            results["warm_client"] = measure(
+                lambda: get_currencies(codes, url=url, client=client), calls)
+
+            validators = ValidatorStore()
+            results["conditional"] = measure(
+                lambda: get_currencies(codes, url=url, client=client, validators=validators),
+                calls)
+
+            cache = RatesCache(ttl=3600)
+            results["warm_cache"] = measure(
+                lambda: get_currencies(codes, url=url, cache=cache, client=client), calls)
+
+            results["concurrent"] = measure(
+                lambda: get_currencies(codes, url=url, client=client), calls, threads)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк get_currencies на локальном сервере")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="задержка сервера, с")
+    parser.add_argument("--size", type=int, default=50, help="число валют в ответе")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="куда сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    results = run(args.calls, args.threads, latency=args.latency, size=args.size,
+                  error_rate=args.error_rate, malformed_rate=args.malformed_rate)
+
+    print(f"{'сценарий':<12} {'вызовов/с':>10} {'p50, мс':>9} {'p99, мс':>9} {'ошибок':>7}")
+    for name, row in results.items():
+        print(f"{name:<12} {row['calls_per_sec']:>10.1f} {row['p50_ms']:>9.3f} "
+              f"{row['p99_ms']:>9.3f} {row['errors']:>7}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
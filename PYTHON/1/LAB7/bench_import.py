@@ -0,0 +1,110 @@
+"""
+Бенчмарк времени импорта модулей лабораторной и проверка, что импорт
+не создаёт файлов (логи открываются лениво, при первой записи) и укладывается
+в бюджет времени LIMITS_MS. Бюджет сравнивается с минимальным временем:
+оно меньше всего зависит от фоновой нагрузки.
+
+Каждый замер — отдельный процесс Python в пустом временном каталоге.
+
+Запуск:
+    python bench_import.py --runs 10 logtools cbr_rates solver_quad
+    python bench_import.py --max-ms solver_quad=20 solver_quad
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import statistics
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Бюджет времени импорта (мс сверх голого интерпретатора). Запас большой,
+# чтобы не падать на медленных машинах, но лишний тяжёлый импорт
+# (например, numpy в solver_quad) его превышает
+LIMITS_MS = {
+    "logtools": 80.0,
+    "cbr_rates": 400.0,
+    "solver_quad": 80.0,
+}
+
+
+def import_in_subprocess(module: str, cwd: str) -> float:
+    """Время (секунды) запуска интерпретатора с импортом module."""
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=cwd, env=env, check=True)
+    return time.perf_counter() - started
+
+
+def run(modules: List[str], runs: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Медиана и минимум времени импорта для каждого модуля, а также
+    список файлов, созданных импортом (должен быть пуст).
+    """
+    results = {}
+    baseline = None
+    for module in ["sys"] + modules:
+        with tempfile.TemporaryDirectory() as cwd:
+            times = [import_in_subprocess(module, cwd) for _ in range(runs)]
+            created = sorted(os.listdir(cwd))
+        if baseline is None:
+            # Время голого интерпретатора — вычитаем его из остальных
+            baseline = min(times)
+            continue
+        results[module] = {
+            "median_ms": (statistics.median(times) - baseline) * 1000,
+            "min_ms": (min(times) - baseline) * 1000,
+            "created_files": created,
+        }
+    return results
+
+
+def check_limits(results: Dict[str, Dict[str, float]],
+                 limits: Dict[str, float]) -> List[str]:
+    """Описания нарушений: созданные импортом файлы и превышение бюджета времени."""
+    problems = []
+    for module, row in results.items():
+        if row["created_files"]:
+            problems.append(f"{module}: импорт создал файлы {', '.join(row['created_files'])}")
+        limit = limits.get(module)
+        if limit is not None and row["min_ms"] > limit:
+            problems.append(f"{module}: импорт {row['min_ms']:.1f} мс дольше бюджета {limit:.1f} мс")
+    return problems
+
+
+def _limit(text: str) -> tuple:
+    module, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("ожидается МОДУЛЬ=МС")
+    return module, float(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Время импорта модулей")
+    parser.add_argument("modules", nargs="*", default=["logtools", "cbr_rates", "solver_quad"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=_limit, action="append", default=[], metavar="МОДУЛЬ=МС",
+                        help="бюджет времени импорта модуля (поверх LIMITS_MS)")
+    args = parser.parse_args()
+
+    limits = dict(LIMITS_MS, **dict(args.max_ms))
+    results = run(args.modules, args.runs)
+
+    print(f"{'модуль':<18} {'медиана, мс':>12} {'мин, мс':>9} {'бюджет, мс':>11}  созданные файлы")
+    for module, row in results.items():
+        limit = limits.get(module)
+        print(f"{module:<18} {row['median_ms']:>12.1f} {row['min_ms']:>9.1f} "
+              f"{'—' if limit is None else f'{limit:.1f}':>11}  "
+              f"{', '.join(row['created_files']) or '—'}")
+
+    problems = check_limits(results, limits)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Бенчмарк solve_poly_batch против numpy.roots в цикле по строкам.
+
+Смесь степеней 1–4 в равных долях, коэффициенты случайные: равномерные
+в [-10, 10] или, с --spread, со случайным знаком и модулем 10^U(-spread, spread).
+
+Запуск:
+    python bench_poly.py --rows 100000 --spread 3
+"""
+import time
+import argparse
+from typing import Dict, Optional
+
+import numpy as np
+
+import logtools
+from solver_poly import solve_poly_batch
+
+
+def make_coefficients(rows: int, seed: int = 0, spread: Optional[float] = None) -> np.ndarray:
+    """
+    Случайные многочлены степеней 1–4 в формате (rows, 5) с ведущими нулями.
+
+    spread — разброс порядков: модули коэффициентов 10^U(-spread, spread)
+    (None — равномерно в [-10, 10]).
+    """
+    rng = np.random.default_rng(seed)
+    if spread is None:
+        c = rng.uniform(-10, 10, (rows, 5))
+    else:
+        c = 10.0 ** rng.uniform(-spread, spread, (rows, 5)) * rng.choice([-1.0, 1.0], (rows, 5))
+    degree = rng.integers(1, 5, rows)
+    c[np.arange(5)[None, :] < (4 - degree)[:, None]] = 0.0
+    return c
+
+
+def run(rows: int = 20000, loop_rows: int = 5000, spread: Optional[float] = None) -> Dict[str, float]:
+    """
+    Строк в секунду для solve_poly_batch и для цикла numpy.roots
+    (цикл меряется на первых loop_rows строках — он слишком медленный).
+    """
+    c = make_coefficients(rows, spread=spread)
+    logtools.set_enabled(False)
+    try:
+        started = time.perf_counter()
+        solve_poly_batch(c, complex_roots=True)
+        batch = time.perf_counter() - started
+    finally:
+        logtools.set_enabled(True)
+
+    loop_rows = min(loop_rows, rows)
+    started = time.perf_counter()
+    for row in c[:loop_rows]:
+        np.roots(row)
+    loop = time.perf_counter() - started
+
+    return {
+        "batch_rows_per_sec": rows / batch,
+        "np_roots_rows_per_sec": loop_rows / loop,
+        "speedup": (rows / batch) / (loop_rows / loop),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="solve_poly_batch против numpy.roots")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--loop-rows", type=int, default=5000)
+    parser.add_argument("--spread", type=float, default=None,
+                        help="разброс порядков коэффициентов (10^±spread)")
+    args = parser.parse_args()
+
+    result = run(args.rows, args.loop_rows, args.spread)
+    print(f"solve_poly_batch : {result['batch_rows_per_sec']:>12.0f} строк/с")
+    print(f"numpy.roots цикл : {result['np_roots_rows_per_sec']:>12.0f} строк/с")
+    print(f"ускорение        : {result['speedup']:>12.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Бенчмарк накладных расходов декоратора trace.
+
+Сравнивает стоимость вызова простой функции без декоратора и под trace
+в разных режимах: глобально выключен, логгер не пишет INFO, выборка
+1 из 100, ограничение скорости, полное логирование в память.
+
+Запуск:
+    python bench_trace.py --calls 200000
+"""
+import io
+import time
+import logging
+import argparse
+from typing import Callable, Dict
+
+import logtools
+from logtools import trace
+
+
+def _per_call_ns(fn: Callable, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(i, 2)
+    return (time.perf_counter() - started) / calls * 1e9
+
+
+def run(calls: int = 100000) -> Dict[str, float]:
+    """Наносекунды на вызов в каждом режиме."""
+    quiet = logging.getLogger("bench_trace_quiet")
+    quiet.setLevel(logging.WARNING)
+    sink = io.StringIO()
+
+    def add(a, b):
+        return a + b
+
+    variants = {
+        "plain": add,
+        "disabled": trace(add, handle=sink),
+        "logger_off": trace(add, handle=quiet),
+        "sample_1_in_100": trace(add, handle=sink, sample_every=100),
+        "rate_limit_10_per_s": trace(add, handle=sink, rate_limit=10),
+        "full": trace(add, handle=sink),
+    }
+
+    results = {}
+    for name, fn in variants.items():
+        logtools.set_enabled(name != "disabled")
+        try:
+            results[name] = _per_call_ns(fn, calls)
+        finally:
+            logtools.set_enabled(True)
+        sink.seek(0)
+        sink.truncate()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Накладные расходы trace")
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+
+    results = run(args.calls)
+    base = results["plain"]
+    print(f"{'режим':<22} {'нс/вызов':>10} {'×plain':>8}")
+    for name, ns in results.items():
+        print(f"{name:<22} {ns:>10.1f} {ns / base:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
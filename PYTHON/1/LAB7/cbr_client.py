@@ -0,0 +1,95 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class CbrClient:
+    """
+    Переиспользуемый HTTP-клиент для API ЦБ.
+
+    Держит одну keep-alive сессию requests с пулом соединений, поэтому
+    TCP/TLS рукопожатие выполняется один раз, а не на каждый запрос.
+    Сессия общая для всех потоков: пул соединений urllib3 потокобезопасен,
+    а изменяемого состояния на уровне запроса у сессии нет — cookies
+    отключены, заголовки передаются в каждый запрос отдельно. Одновременно
+    до pool_size потоков получают каждый своё соединение из пула.
+
+    Параметры:
+        pool_size       — максимальное число соединений в пуле на хост
+                          (имеет смысл задавать равным числу потоков)
+        retries         — число повторов при сетевых ошибках и 5xx/429
+        backoff_factor  — множитель экспоненциальной паузы между повторами
+        connect_timeout — таймаут установки соединения, секунды
+        read_timeout    — таймаут чтения ответа, секунды
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, pool_size: int = 10, retries: int = 2,
+                 backoff_factor: float = 0.3,
+                 connect_timeout: float = 3.05, read_timeout: float = 5.0) -> None:
+        if pool_size <= 0:
+            raise ValueError("pool_size должен быть положительным")
+        if retries < 0:
+            raise ValueError("retries не может быть отрицательным")
+
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (f"CbrClient(pool_size={self.pool_size}, retries={self.retries}, "
+                f"timeout={self.timeout})")
+
+    def _make_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                              max_retries=retry)
+        session = requests.Session()
+        # Общая сессия не должна переносить cookies одного запроса в другой
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """Общая сессия (создаётся при первом обращении)."""
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._make_session()
+                session = self._session
+        return session
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET через пул соединений. Исключения — requests.exceptions.RequestException."""
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Закрывает сессию и все соединения пула."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    def __enter__(self) -> "CbrClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
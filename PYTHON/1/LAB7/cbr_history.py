@@ -0,0 +1,233 @@
+import os
+import json
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+import numpy as np
+import requests
+
+from cbr_rates import _valute_from_json
+from cbr_client import CbrClient
+
+
+ARCHIVE_URL = "https://www.cbr-xml-daily.ru/archive/{date:%Y/%m/%d}/daily_json.js"
+
+
+def _today() -> datetime.date:
+    return datetime.date.today()
+
+
+def _as_date(value: datetime.date) -> datetime.date:
+    """datetime.datetime → date: хранилище сравнивает даты без времени."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+class RatesStore:
+    """
+    Локальное колоночное хранилище исторических курсов: таблица дата × валюта.
+
+    Файлы в каталоге path:
+        dates.npy — отсортированные даты (datetime64[D])
+        rates.npy — матрица float64 формы (len(dates), len(codes)),
+                    NaN — курс в этот день не публиковался
+        codes.json — коды валют, порядок столбцов
+
+    Сохраняются все валюты из ответа за день, а не только запрошенные,
+    поэтому скачанный день больше никогда не запрашивается повторно.
+    Значения — поле "Value" как в get_currencies (за Nominal единиц).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.codes: List[str] = []
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.rates = np.empty((0, 0), dtype=np.float64)
+        self._load()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self) -> None:
+        if not os.path.exists(self._file("codes.json")):
+            return
+        with open(self._file("codes.json"), encoding="utf-8") as f:
+            self.codes = json.load(f)
+        # Только чтение с диска по требованию — большие таблицы не грузятся целиком
+        self.dates = np.load(self._file("dates.npy"), mmap_mode="r")
+        self.rates = np.load(self._file("rates.npy"), mmap_mode="r")
+
+    def _save_array(self, name: str, array: np.ndarray) -> None:
+        tmp = self._file(name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, self._file(name))
+
+    def missing(self, dates: Iterable[datetime.date]) -> List[datetime.date]:
+        """Даты из списка, которых ещё нет в хранилище."""
+        stored = set(self.dates.astype(object).tolist())
+        return [d for d in dates if d not in stored]
+
+    def add(self, days: Dict[datetime.date, Optional[Dict[str, Any]]]) -> None:
+        """
+        Добавляет скачанные дни и сохраняет таблицу на диск.
+
+        days — {дата: словарь "Valute" или None, если ЦБ не публиковал курсы}.
+        """
+        if not days:
+            return
+
+        with self._lock:
+            codes = list(self.codes)
+            index = {code: i for i, code in enumerate(codes)}
+            for valute in days.values():
+                for code in valute or ():
+                    if code not in index:
+                        index[code] = len(codes)
+                        codes.append(code)
+
+            new_rates = np.full((len(days), len(codes)), np.nan)
+            new_dates = np.array(list(days), dtype="datetime64[D]")
+            for row, valute in enumerate(days.values()):
+                for code, record in (valute or {}).items():
+                    value = record.get("Value")
+                    if isinstance(value, (int, float)):
+                        new_rates[row, index[code]] = value
+
+            old_rates = np.full((len(self.dates), len(codes)), np.nan)
+            old_rates[:, :len(self.codes)] = self.rates
+
+            dates = np.concatenate([np.asarray(self.dates), new_dates])
+            rates = np.vstack([old_rates, new_rates])
+            order = np.argsort(dates, kind="stable")
+
+            # Отпускаем отображённые в память файлы перед их заменой
+            self.dates = self.dates[:0].copy()
+            self.rates = np.empty((0, 0))
+
+            self._save_array("dates.npy", dates[order])
+            self._save_array("rates.npy", rates[order])
+            with open(self._file("codes.json"), "w", encoding="utf-8") as f:
+                json.dump(codes, f)
+
+            self._load()
+
+    def table(self, currency_codes: List[str], start: datetime.date,
+              end: datetime.date) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Срез таблицы за [start, end] по нужным валютам.
+
+        Возвращает (даты, матрица курсов); валюта, которой нет в хранилище, — KeyError.
+        """
+        index = {code: i for i, code in enumerate(self.codes)}
+        for code in currency_codes:
+            if code not in index:
+                raise KeyError(f"Валюта '{code}' отсутствует в данных ЦБ")
+
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+
+        columns = [index[code] for code in currency_codes]
+        return np.array(self.dates[lo:hi]), np.array(self.rates[lo:hi][:, columns])
+
+
+def _fetch_archive_day(client: CbrClient, day: datetime.date,
+                       url_template: str) -> Optional[Dict[str, Any]]:
+    """
+    Скачивает архивный файл за день. None — ЦБ не публиковал курсы (404, выходной).
+
+    Исключения: ConnectionError, ValueError, KeyError — как у get_currencies.
+    """
+    try:
+        response = client.get(url_template.format(date=day))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+    except requests.exceptions.RequestException as exc:
+        raise ConnectionError("API недоступен или URL неверный") from exc
+
+    try:
+        data: Dict[str, Any] = response.json()
+    except ValueError as exc:
+        raise ValueError("Некорректный JSON от API") from exc
+
+    return _valute_from_json(data)
+
+
+def get_currencies_range(currency_codes: List[str],
+                         start: datetime.date,
+                         end: datetime.date,
+                         path: str,
+                         workers: int = 8,
+                         client: Optional[CbrClient] = None,
+                         url_template: str = ARCHIVE_URL) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Массовая загрузка исторических курсов за период [start, end].
+
+    Недостающие дни скачиваются параллельно пулом из workers потоков и
+    дописываются в RatesStore(path); уже сохранённые дни не запрашиваются.
+
+    Параметры:
+        currency_codes : список кодов валют, например ["USD", "EUR"]
+        start, end     : границы периода включительно
+        path           : каталог локального хранилища
+        workers        : размер пула потоков
+        client         : CbrClient (если не задан — создаётся с пулом на workers соединений)
+        url_template   : шаблон адреса архивного файла с полем {date}
+
+    Возвращает:
+        (даты datetime64[D], матрица курсов float64 формы (дни, валюты));
+        NaN — в этот день курс не публиковался. Пустой ответ (404) за сегодня
+        и будущие дни не сохраняется — такие дни отсутствуют в результате
+        и будут запрошены снова при следующем вызове
+
+    Исключения:
+        ConnectionError, ValueError, KeyError — как у get_currencies.
+        При ошибке успешно скачанные дни всё равно сохраняются.
+    """
+    start, end = _as_date(start), _as_date(end)
+    if start > end:
+        raise ValueError("Начало периода не может быть позже конца")
+    if workers <= 0:
+        raise ValueError("workers должен быть положительным")
+
+    store = RatesStore(path)
+    days = [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+    todo = store.missing(days)
+
+    if todo:
+        own_client = client is None
+        if own_client:
+            client = CbrClient(pool_size=workers)
+
+        fetched: Dict[datetime.date, Optional[Dict[str, Any]]] = {}
+        error: Optional[Exception] = None
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {day: pool.submit(_fetch_archive_day, client, day, url_template)
+                           for day in todo}
+                for day, future in futures.items():
+                    try:
+                        fetched[day] = future.result()
+                    except (ConnectionError, ValueError, KeyError) as exc:
+                        if error is None:
+                            error = exc
+        finally:
+            if own_client:
+                client.close()
+
+        # Пустой день сохраняется навсегда, только если он уже закрыт:
+        # за сегодня курс может ещё не выйти, 404 может быть временным
+        today = _today()
+        store.add({day: valute for day, valute in fetched.items()
+                   if valute is not None or day < today})
+        if error is not None:
+            raise error
+
+    return store.table(currency_codes, start, end)
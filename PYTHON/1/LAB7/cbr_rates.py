@@ -1,52 +1,129 @@
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from logtools import trace, file_logger
+from trace_render import bounded_repr
+from rates_cache import RatesCache, ValidatorStore, SingleFlight
+from cbr_client import CbrClient
 
 
-@trace(handle=file_logger)
-def get_currencies(currency_codes: List[str],
-                   url: str = "https://www.cbr-xml-daily.ru/daily_json.js") -> Dict[str, float]:
-    """
-    Получает курсы валют с сайта ЦБ РФ.
+DEFAULT_URL = "https://www.cbr-xml-daily.ru/daily_json.js"
 
-    Параметры:
-        currency_codes : список кодов валют, например ["USD", "EUR"]
-        url : адрес API ЦБ
+# Одновременные запросы к одному URL из разных потоков выполняются один раз
+_inflight = SingleFlight()
 
-    Возвращает:
-        словарь вида {"USD": 93.25, "EUR": 101.7}
 
-    Исключения:
-        ConnectionError — API недоступен, сеть не отвечает, неправильный URL
-        ValueError      — некорректный JSON в ответе
-        KeyError        — нет ключа "Valute" или отсутствует конкретная валюта
-        TypeError       — курс валюты имеет неправильный тип
+def _fetch_valute(url: str, client: Optional[CbrClient] = None,
+                  validators: Optional[ValidatorStore] = None) -> Dict[str, Any]:
+    """
+    Скачивает ответ API, разбирает JSON и возвращает словарь "Valute".
+    Если передан client, запрос идёт через его пул соединений.
+    Если переданы validators, запрос условный, и на 304 возвращается
+    сохранённый "Valute" без загрузки и разбора документа.
+
+    Исключения те же, что у get_currencies (ConnectionError, ValueError, KeyError).
     """
+    headers = validators.headers(url) if validators is not None else None
 
     # 1. Запрос к API — здесь могут возникнуть сетевые исключения
     try:
-        response = requests.get(url, timeout=5)
+        if client is None:
+            response = requests.get(url, headers=headers, timeout=5)
+        else:
+            response = client.get(url, headers=headers)
         response.raise_for_status()
     except requests.exceptions.RequestException as exc:
         # Требование лабораторной: здесь должна быть только бизнес-логика
         # поэтому просто пробрасываем исключение
         raise ConnectionError("API недоступен или URL неверный") from exc
 
+    if validators is not None and response.status_code == 304:
+        valute_data = validators.reuse(url)
+        if valute_data is not None:
+            return valute_data
+        # 304 без сохранённых данных — повторяем запрос безусловно
+        return _fetch_valute(url, client)
+
     # 2. Пытаемся распарсить JSON
     try:
         data: Dict[str, Any] = response.json()
     except ValueError as exc:
         raise ValueError("Некорректный JSON от API") from exc
 
-    # 3. Проверяем наличие ключа Valute
+    valute_data = _valute_from_json(data)
+
+    if validators is not None:
+        validators.store(url, response.headers.get("ETag"),
+                         response.headers.get("Last-Modified"), valute_data)
+
+    return valute_data
+
+
+def _valute_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Достаёт "Valute" из распарсенного ответа API.
+    ValueError, если ответ не JSON-объект; KeyError, если ключа нет.
+    """
+
+    # 3. Корректный JSON может оказаться не объектом (null, число, список)
+    if not isinstance(data, dict):
+        raise ValueError("Некорректный JSON от API")
+
+    # 4. Проверяем наличие ключа Valute
     if "Valute" not in data:
         raise KeyError("В ответе API отсутствует ключ 'Valute'")
 
-    valute_data = data["Valute"]
+    return data["Valute"]
+
+
+def _flight_key(url: str, cache: Optional[RatesCache] = None,
+                client: Optional[CbrClient] = None,
+                validators: Optional[ValidatorStore] = None) -> tuple:
+    """
+    Ключ single-flight для запроса url: общий запрос разделяют только потоки
+    с теми же cache, client и validators, иначе кэш или validators
+    присоединившегося потока остались бы пустыми.
+    """
+    return url, id(cache), id(client), id(validators)
+
+
+def _get_valute(url: str, cache: Optional[RatesCache] = None,
+                client: Optional[CbrClient] = None,
+                validators: Optional[ValidatorStore] = None) -> Dict[str, Any]:
+    """
+    Словарь "Valute" для url: из кэша, если он свежий, иначе с сервера.
+    Потоки, одновременно запросившие один url с теми же cache, client
+    и validators, разделяют один запрос и разбор — иначе присоединившийся
+    поток получил бы данные, но его кэш и validators остались бы пустыми.
+    """
+    valute_data = cache.get(url) if cache is not None else None
+
+    if valute_data is None:
+        def fetch() -> Dict[str, Any]:
+            # Предыдущий ведущий поток мог заполнить кэш между нашим
+            # промахом и входом в single-flight
+            if cache is not None:
+                cached = cache.get(url, count_miss=False)
+                if cached is not None:
+                    return cached
+
+            fetched = _fetch_valute(url, client, validators)
+            if cache is not None:
+                cache.put(url, fetched)
+            return fetched
 
+        valute_data = _inflight.do(_flight_key(url, cache, client, validators), fetch)
+
+    return valute_data
+
+
+def _extract_rates(valute_data: Dict[str, Any], currency_codes: List[str]) -> Dict[str, float]:
+    """
+    Достаёт курсы нужных валют из словаря "Valute" с проверкой данных.
+
+    Исключения: KeyError, TypeError — как у get_currencies.
+    """
     result: Dict[str, float] = {}
 
-    # 4. Достаём нужные валюты
     for code in currency_codes:
 
         if code not in valute_data:
@@ -66,3 +143,38 @@ def get_currencies(currency_codes: List[str],
         result[code] = float(value)
 
     return result
+
+
+# Список кодов и словарь курсов могут быть большими — логируем их в урезанном виде
+@trace(handle=file_logger, render=bounded_repr)
+def get_currencies(currency_codes: List[str],
+                   url: str = DEFAULT_URL,
+                   cache: Optional[RatesCache] = None,
+                   client: Optional[CbrClient] = None,
+                   validators: Optional[ValidatorStore] = None) -> Dict[str, float]:
+    """
+    Получает курсы валют с сайта ЦБ РФ.
+
+    Параметры:
+        currency_codes : список кодов валют, например ["USD", "EUR"]
+        url : адрес API ЦБ
+        cache : RatesCache — если задан, распарсенный ответ берётся из кэша,
+                пока не истёк его TTL (без сети и без разбора JSON)
+        client : CbrClient — если задан, запрос идёт через его общий пул
+                 keep-alive соединений с повторами и таймаутами
+        validators : ValidatorStore — если задан, запрос условный
+                     (If-None-Match / If-Modified-Since), и на ответ 304
+                     возвращается сохранённый "Valute" без загрузки и разбора
+
+    Возвращает:
+        словарь вида {"USD": 93.25, "EUR": 101.7}
+
+    Исключения:
+        ConnectionError — API недоступен, сеть не отвечает, неправильный URL
+        ValueError      — некорректный JSON в ответе
+        KeyError        — нет ключа "Valute" или отсутствует конкретная валюта
+        TypeError       — курс валюты имеет неправильный тип
+    """
+
+    valute_data = _get_valute(url, cache, client, validators)
+    return _extract_rates(valute_data, currency_codes)
@@ -0,0 +1,118 @@
+import json
+import asyncio
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import aiohttp
+
+from cbr_rates import DEFAULT_URL, _valute_from_json, _extract_rates
+
+
+async def _fetch_valute_async(session: aiohttp.ClientSession, url: str,
+                              timeout: float) -> Dict[str, Any]:
+    """
+    Асинхронный аналог cbr_rates._fetch_valute: скачивает ответ и возвращает "Valute".
+
+    Исключения те же: ConnectionError, ValueError, KeyError.
+    """
+
+    # 1. Запрос к API, не блокируя цикл событий
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            body = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        raise ConnectionError("API недоступен или URL неверный") from exc
+
+    # 2. ЦБ отдаёт daily_json.js как application/javascript,
+    #    поэтому разбираем тело сами, а не через response.json()
+    try:
+        data: Dict[str, Any] = json.loads(body)
+    except ValueError as exc:
+        raise ValueError("Некорректный JSON от API") from exc
+
+    return _valute_from_json(data)
+
+
+async def get_currencies_async(currency_codes: List[str],
+                               url: str = DEFAULT_URL,
+                               session: Optional[aiohttp.ClientSession] = None,
+                               timeout: float = 5) -> Dict[str, float]:
+    """
+    Асинхронная версия cbr_rates.get_currencies с тем же контрактом.
+
+    Параметры:
+        currency_codes : список кодов валют, например ["USD", "EUR"]
+        url : адрес API ЦБ
+        session : общая aiohttp.ClientSession (если не задана — создаётся на один вызов)
+        timeout : общий таймаут запроса, секунды
+
+    Возвращает:
+        словарь вида {"USD": 93.25, "EUR": 101.7}
+
+    Исключения:
+        ConnectionError — API недоступен, сеть не отвечает, неправильный URL
+        ValueError      — некорректный JSON в ответе
+        KeyError        — нет ключа "Valute" или отсутствует конкретная валюта
+        TypeError       — курс валюты имеет неправильный тип
+    """
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            valute_data = await _fetch_valute_async(own_session, url, timeout)
+    else:
+        valute_data = await _fetch_valute_async(session, url, timeout)
+
+    return _extract_rates(valute_data, currency_codes)
+
+
+async def get_currencies_many(currency_codes: List[str],
+                              urls: Sequence[str],
+                              limit: int = 10,
+                              session: Optional[aiohttp.ClientSession] = None,
+                              timeout: float = 5,
+                              return_exceptions: bool = False
+                              ) -> List[Union[Dict[str, float], BaseException]]:
+    """
+    Параллельно получает курсы из нескольких адресов (зеркала, архивные даты).
+
+    Одновременно выполняется не больше limit запросов. Результаты идут
+    в том же порядке, что и urls.
+
+    Параметры:
+        currency_codes    : список кодов валют
+        urls              : адреса API
+        limit             : максимальное число одновременных запросов
+        session           : общая aiohttp.ClientSession (если не задана — создаётся своя)
+        timeout           : таймаут одного запроса, секунды
+        return_exceptions : вернуть исключения в списке вместо того,
+                            чтобы пробросить первое из них (остальные
+                            запросы при этом отменяются)
+
+    Исключения:
+        те же, что у get_currencies_async (если return_exceptions=False)
+    """
+    if limit <= 0:
+        raise ValueError("limit должен быть положительным")
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _one(client: aiohttp.ClientSession, url: str) -> Dict[str, float]:
+        async with semaphore:
+            return await get_currencies_async(currency_codes, url, client, timeout)
+
+    async def _all(client: aiohttp.ClientSession):
+        tasks = [asyncio.ensure_future(_one(client, url)) for url in urls]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            # gather пробрасывает первую ошибку, не останавливая остальные запросы —
+            # отменяем их и дожидаемся, пока сессия ещё открыта
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    if session is None:
+        connector = aiohttp.TCPConnector(limit=limit)
+        async with aiohttp.ClientSession(connector=connector) as own_session:
+            return list(await _all(own_session))
+    return list(await _all(session))
@@ -0,0 +1,172 @@
+import json
+import time
+import random
+import hashlib
+import itertools
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+
+
+def make_payload(size: int = 50, seed: int = 0) -> Dict[str, Any]:
+    """
+    Ответ в формате daily_json.js с size валютами.
+
+    Первыми идут USD и EUR, остальные коды — синтетические трёхбуквенные.
+    """
+    rng = random.Random(seed)
+    codes = ["USD", "EUR"]
+    for letters in itertools.product("ABCDFGHJKLMNPQRSTVWXZ", repeat=3):
+        if len(codes) >= size:
+            break
+        code = "".join(letters)
+        if code not in codes:
+            codes.append(code)
+
+    valute = {}
+    for code in codes[:size]:
+        value = round(rng.uniform(0.5, 150.0), 4)
+        valute[code] = {
+            "ID": f"R0{rng.randint(1000, 9999)}",
+            "NumCode": f"{rng.randint(1, 999):03d}",
+            "CharCode": code,
+            "Nominal": 1,
+            "Name": f"Валюта {code}",
+            "Value": value,
+            "Previous": round(value * rng.uniform(0.98, 1.02), 4),
+        }
+
+    return {
+        "Date": "2024-01-10T11:30:00+03:00",
+        "PreviousDate": "2024-01-09T11:30:00+03:00",
+        "Timestamp": "2024-01-10T12:00:00+03:00",
+        "Valute": valute,
+    }
+
+
+class CbrStubServer:
+    """
+    Локальная замена API ЦБ для тестов и бенчмарков.
+
+    Отдаёт daily_json.js-подобный ответ по любому пути и умеет имитировать
+    проблемы реального сервера. Поддерживает ETag / If-None-Match (ответ 304).
+
+    Параметры:
+        latency        : задержка перед ответом, секунды
+        size           : число валют в ответе
+        error_rate     : доля ответов 500 (0..1)
+        malformed_rate : доля ответов с испорченным JSON (0..1)
+        seed           : зерно генератора для воспроизводимости
+
+    Пример:
+        with CbrStubServer(latency=0.01) as server:
+            get_currencies(["USD"], url=server.url)
+    """
+
+    def __init__(self, latency: float = 0.0, size: int = 50,
+                 error_rate: float = 0.0, malformed_rate: float = 0.0,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0) -> None:
+        if not 0 <= error_rate <= 1 or not 0 <= malformed_rate <= 1:
+            raise ValueError("Доли ошибок должны быть в диапазоне [0, 1]")
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.body = json.dumps(make_payload(size, seed), ensure_ascii=False).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.requests = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/daily_json.js"
+
+    def _roll(self) -> float:
+        with self._lock:
+            self.requests += 1
+            return self._random.random()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, как у настоящего сервера
+            # Заголовки и тело уходят одним пакетом, иначе keep-alive упирается
+            # в алгоритм Нейгла и задержанный ACK (~40 мс на запрос)
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: Dict[str, str] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                roll = stub._roll()
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if roll < stub.error_rate:
+                    self._send(500, b"Internal Server Error")
+                elif roll < stub.error_rate + stub.malformed_rate:
+                    self._send(200, stub.body[:len(stub.body) // 2],
+                               {"Content-Type": "application/javascript"})
+                elif self.headers.get("If-None-Match") == stub.etag:
+                    self._send(304, headers={"ETag": stub.etag})
+                else:
+                    self._send(200, stub.body, {"Content-Type": "application/javascript",
+                                                "ETag": stub.etag})
+
+        return Handler
+
+    def start(self) -> "CbrStubServer":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="cbr-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и освобождает порт."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "CbrStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Локальная замена API ЦБ")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = CbrStubServer(latency=args.latency, size=args.size, error_rate=args.error_rate,
+                           malformed_rate=args.malformed_rate, port=args.port)
+    print(f"Сервер запущен: {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
@@ -0,0 +1,163 @@
+import queue
+import atexit
+import threading
+import time
+from typing import List, Optional, TextIO, Union
+
+
+class _FlushRequest:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class QueuedSink:
+    """
+    Неблокирующий приёмник логов с фоновым потоком-писателем.
+
+    write() только кладёт строку в ограниченную очередь; запись в файл
+    или поток делает отдельный поток пачками — когда накопилось batch_size
+    строк или прошло flush_interval секунд с первой строки пачки.
+    Вызывающий поток не делает файлового ввода-вывода и не ждёт блокировку
+    обработчика. Объект можно передать прямо в trace(handle=...).
+
+    Параметры:
+        target         : путь к файлу (открывается на дозапись) или поток с write()
+        maxsize        : размер очереди (строк)
+        batch_size     : максимальный размер пачки
+        flush_interval : максимальная задержка записи пачки, секунды
+        policy         : "drop" — при полной очереди строка отбрасывается
+                         (счётчик dropped), "block" — вызывающий ждёт место
+    """
+
+    POLICIES = ("drop", "block")
+
+    def __init__(self, target: Union[str, TextIO], maxsize: int = 10000,
+                 batch_size: int = 256, flush_interval: float = 0.5,
+                 policy: str = "drop", encoding: str = "utf-8") -> None:
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy должен быть одним из {self.POLICIES}")
+        if maxsize <= 0 or batch_size <= 0:
+            raise ValueError("maxsize и batch_size должны быть положительными")
+        if flush_interval < 0:
+            raise ValueError("flush_interval не может быть отрицательным")
+
+        if isinstance(target, str):
+            self._stream = open(target, "a", encoding=encoding)
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-sink-writer", daemon=True)
+        self._thread.start()
+
+        # Досылаем хвост очереди при завершении интерпретатора
+        atexit.register(self.close)
+
+    def __repr__(self) -> str:
+        return f"QueuedSink(policy={self.policy!r}, batch_size={self.batch_size})"
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, text: str) -> int:
+        """Ставит строку в очередь на запись. Возвращает её длину, как у потока."""
+        if self._closed:
+            raise ValueError("Запись в закрытый QueuedSink")
+
+        if self.policy == "block":
+            self._queue.put(text)
+        else:
+            try:
+                self._queue.put_nowait(text)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+        return len(text)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт, пока всё поставленное в очередь до вызова будет записано."""
+        if self._closed:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self) -> None:
+        """Записывает остаток очереди, останавливает поток и закрывает свой файл."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._owns_stream:
+            self._stream.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "QueuedSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_batch(self, batch: List[str]) -> None:
+        if not batch:
+            return
+        try:
+            self._stream.write("".join(batch))
+            self._stream.flush()
+            self.written += len(batch)
+        except (OSError, ValueError):
+            # Ошибка записи не должна убивать поток-писатель
+            self.errors += 1
+        batch.clear()
+
+    def _run(self) -> None:
+        batch: List[str] = []
+        deadline = 0.0
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Истекло flush_interval с первой строки пачки
+                self._write_batch(batch)
+                continue
+
+            # Забираем всё, что уже лежит в очереди, без лишних пробуждений
+            while True:
+                if item is _STOP:
+                    self._write_batch(batch)
+                    return
+                if isinstance(item, _FlushRequest):
+                    self._write_batch(batch)
+                    item.done.set()
+                else:
+                    if not batch:
+                        deadline = time.monotonic() + self.flush_interval
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        self._write_batch(batch)
+
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
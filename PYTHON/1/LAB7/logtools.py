@@ -1,19 +1,71 @@
+import os
 import sys
+import time
 import logging
+import inspect
 import functools
-from typing import Any, Callable
+from typing import Any, Callable, Optional, Union
 
+from trace_metrics import MetricsRegistry, default_registry
+from trace_sampling import Sampler
 
-def trace(func: Callable = None, *, handle=sys.stdout):
+
+# Глобальный выключатель трассировки: при False декорированные функции
+# только вызывают исходную функцию, без форматирования и записи логов
+_enabled = True
+
+
+def set_enabled(enabled: bool) -> None:
+    """Включает или выключает trace для всех декорированных функций сразу."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    """Включена ли трассировка глобально."""
+    return _enabled
+
+
+def trace(func: Callable = None, *, handle=sys.stdout,
+          metrics: Union[bool, MetricsRegistry] = False,
+          sample_every: int = 1, rate_limit: Optional[float] = None,
+          burst: Optional[int] = None, always_log_errors: bool = True,
+          render: Callable[[Any], str] = repr):
     """
     Универсальный логирующий декоратор.
     Поддерживает:
         • обычные потоки (stdout, StringIO) через write()
         • logging.Logger через info()/error()
+        • log_sinks.QueuedSink — неблокирующая запись фоновым потоком
+        • trace_records.JsonlSink / BinarySink — структурированные записи:
+          одна запись на вызов (функция, время, длительность, итог, аргументы)
 
     Параметры:
         func   — функция, которую оборачиваем
         handle — поток или логгер
+        metrics — MetricsRegistry (или True для trace_metrics.default_registry):
+                  на каждый вызов записываются реальное и CPU-время, ошибки
+                  и гистограмма задержек, а в лог добавляется длительность
+        sample_every — логировать в среднем один вызов из sample_every
+        rate_limit   — логировать не больше rate_limit вызовов в секунду
+                       (своё маркерное ведро у каждой функции, размер burst)
+        always_log_errors — ошибки логируются даже у пропущенных вызовов
+        render — функция отображения аргументов и результата (по умолчанию
+                 repr); trace_render.bounded_repr ограничивает длину строки
+                 и её стоимость для больших массивов и коллекций
+
+    Пропущенный выборкой вызов не делает ни repr, ни форматирования строк;
+    метрики (metrics) при этом считаются по всем вызовам.
+
+    Корутины, генераторы и асинхронные генераторы оборачиваются «родными»
+    обёртками: итог, число выданных элементов и ошибка логируются в момент
+    реального окончания работы. Сама обёртка не ждёт и не блокирует цикл
+    событий; запись в handle остаётся синхронной, поэтому для корутин
+    стоит выбирать неблокирующий handle.
+
+    Строки (repr аргументов и результата) собираются лениво: если trace
+    выключен через set_enabled(False) или логгер не пишет INFO, никакой
+    работы с repr и строками не делается.
     """
 
     # Проверяем, что передан логгер (у него есть .info() и нет .write())
@@ -22,6 +74,9 @@ def trace(func: Callable = None, *, handle=sys.stdout):
 
     is_logger = _is_logger(handle)
 
+    # Приёмник структурированных записей (trace_records.JsonlSink / BinarySink)
+    structured = hasattr(handle, "emit_record")
+
     # Функции записи логов в поток или логгер
     def log_info(message: str) -> None:
         if is_logger:
@@ -35,26 +90,212 @@ def trace(func: Callable = None, *, handle=sys.stdout):
         else:
             handle.write(f"ERROR: {message}\n")
 
+    # Для потока пишем всегда, для логгера — только если уровень включён
+    def info_enabled() -> bool:
+        return not is_logger or handle.isEnabledFor(logging.INFO)
+
+    def error_enabled() -> bool:
+        return not is_logger or handle.isEnabledFor(logging.ERROR)
+
+    # Реестр метрик: True — общий default_registry
+    if metrics is True:
+        registry = default_registry
+    else:
+        registry = metrics or None
+
     def decorator(fn: Callable) -> Callable:
-        @functools.wraps(fn)
-        def wrapped(*args, **kwargs) -> Any:
+        name = fn.__name__
+        stats = registry.stats(f"{fn.__module__}.{fn.__qualname__}") if registry else None
+
+        # Своя выборка у каждой декорированной функции
+        sampler = None
+        if sample_every > 1 or rate_limit is not None:
+            sampler = Sampler(sample_every, rate_limit, burst)
+
+        def log_start(args, kwargs):
+            """
+            Логирует запуск. Возвращает контекст вызова (None — вызов не попал
+            в лог и его итог логировать не нужно).
+            """
+            if not info_enabled():
+                return None
+            if sampler is not None and not sampler.should_log():
+                return None
+
             # Формирование сигнатуры вызова
-            args_list = [repr(a) for a in args]
-            kwargs_list = [f"{k}={repr(v)}" for k, v in kwargs.items()]
+            args_list = [render(a) for a in args]
+            kwargs_list = [f"{k}={render(v)}" for k, v in kwargs.items()]
             call_repr = ", ".join(args_list + kwargs_list)
 
+            if structured:
+                # Одна запись на вызов — пишется при завершении
+                return time.time(), time.perf_counter(), call_repr
+
             # Логируем старт
-            log_info(f"Запуск {fn.__name__}({call_repr})")
+            log_info(f"Запуск {name}({call_repr})")
+            return True
 
-            try:
-                result = fn(*args, **kwargs)
-                log_info(f"{fn.__name__} вернула {repr(result)}")
-                return result
-            except Exception as exc:  # Логируем любую ошибку
+        def emit(call, outcome: str, **fields) -> None:
+            record = {"fn": name, "ts": time.time(), "duration": None, "outcome": outcome,
+                      "args": None, "result": None, "items": None, "error": None}
+            if call is not None:
+                record["ts"] = call[0]
+                record["duration"] = time.perf_counter() - call[1]
+                record["args"] = call[2]
+            record.update(fields)
+            handle.emit_record(record)
+
+        def log_returned(call, result, took: str) -> None:
+            if structured:
+                emit(call, "ok", result=render(result))
+            else:
+                log_info(f"{name} вернула {render(result)}{took}")
+
+        def log_items(call, count: int, closed: bool, took: str) -> None:
+            if structured:
+                emit(call, "closed" if closed else "ok", items=count)
+            elif closed:
+                log_info(f"{name} закрыта после {count} элементов{took}")
+            else:
+                log_info(f"{name} выдала {count} элементов{took}")
+
+        def log_failure(exc: Exception, call=True) -> None:
+            if (call or always_log_errors) and error_enabled():
                 exc_type = type(exc).__name__
-                log_error(f"Ошибка в {fn.__name__}: {exc_type}: {exc}")
-                raise
+                if structured:
+                    emit(call or None, "error", error=f"{exc_type}: {exc}")
+                else:
+                    log_error(f"Ошибка в {name}: {exc_type}: {exc}")
+
+        # Замер времени — только если ведутся метрики
+        def start_timer():
+            if stats is None:
+                return None
+            return time.perf_counter(), time.thread_time()
+
+        def stop_timer(timer, error: bool = False, cpu: bool = True) -> str:
+            """Записывает вызов в метрики; возвращает суффикс « за N мс» для лога."""
+            if timer is None:
+                return ""
+            wall = time.perf_counter() - timer[0]
+            stats.record(wall, time.thread_time() - timer[1] if cpu else None, error)
+            return f" за {wall * 1000:.3f} мс"
 
+        if inspect.iscoroutinefunction(fn):
+            # Корутина: итог логируется после await, а не при создании объекта корутины.
+            # CPU-время не считается: в нём были бы и чужие задачи цикла событий
+            @functools.wraps(fn)
+            async def wrapped(*args, **kwargs) -> Any:
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+
+                call = log_start(args, kwargs)
+                timer = start_timer()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as exc:
+                    stop_timer(timer, error=True, cpu=False)
+                    log_failure(exc, call)
+                    raise
+                took = stop_timer(timer, cpu=False)
+                if call:
+                    log_returned(call, result, took)
+                return result
+
+        elif inspect.isasyncgenfunction(fn):
+            # Асинхронный генератор: пробрасываем asend/athrow/aclose
+            # и логируем число элементов, когда генератор реально закончился
+            @functools.wraps(fn)
+            async def wrapped(*args, **kwargs) -> Any:
+                active = _enabled
+                call = log_start(args, kwargs) if active else None
+                timer = start_timer() if active else None
+                agen = fn(*args, **kwargs)
+                count = 0
+                try:
+                    item = await agen.__anext__()
+                    while True:
+                        count += 1
+                        try:
+                            sent = yield item
+                        except GeneratorExit:
+                            await agen.aclose()
+                            took = stop_timer(timer, cpu=False)
+                            if call:
+                                log_items(call, count, True, took)
+                            raise
+                        except BaseException as exc:
+                            item = await agen.athrow(exc)
+                        else:
+                            item = await agen.asend(sent)
+                except StopAsyncIteration:
+                    took = stop_timer(timer, cpu=False)
+                    if call:
+                        log_items(call, count, False, took)
+                except Exception as exc:
+                    if active:
+                        stop_timer(timer, error=True, cpu=False)
+                        log_failure(exc, call)
+                    raise
+
+        elif inspect.isgeneratorfunction(fn):
+            # Генератор: то же, но с send/throw/close
+            @functools.wraps(fn)
+            def wrapped(*args, **kwargs) -> Any:
+                if not _enabled:
+                    return (yield from fn(*args, **kwargs))
+
+                call = log_start(args, kwargs)
+                timer = start_timer()
+                gen = fn(*args, **kwargs)
+                count = 0
+                try:
+                    item = next(gen)
+                    while True:
+                        count += 1
+                        try:
+                            sent = yield item
+                        except GeneratorExit:
+                            gen.close()
+                            took = stop_timer(timer, cpu=False)
+                            if call:
+                                log_items(call, count, True, took)
+                            raise
+                        except BaseException as exc:
+                            item = gen.throw(exc)
+                        else:
+                            item = gen.send(sent)
+                except StopIteration as stop:
+                    took = stop_timer(timer, cpu=False)
+                    if call:
+                        log_items(call, count, False, took)
+                    return stop.value
+                except Exception as exc:
+                    stop_timer(timer, error=True, cpu=False)
+                    log_failure(exc, call)
+                    raise
+
+        else:
+            @functools.wraps(fn)
+            def wrapped(*args, **kwargs) -> Any:
+                # Быстрый путь: логировать нечего — просто вызываем функцию
+                if not _enabled:
+                    return fn(*args, **kwargs)
+
+                call = log_start(args, kwargs)
+                timer = start_timer() if stats is not None else None
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as exc:  # Логируем любую ошибку
+                    stop_timer(timer, error=True)
+                    log_failure(exc, call)
+                    raise
+                took = stop_timer(timer) if timer is not None else ""
+                if call:
+                    log_returned(call, result, took)
+                return result
+
+        wrapped.sampler = sampler
         return wrapped
 
     # Декоратор вызван как @trace(handle=…)
@@ -65,10 +306,54 @@ def trace(func: Callable = None, *, handle=sys.stdout):
     return decorator(func)
 
 
-# Дополнительно создадим логгер для записи в файл 
+# Логгер для записи в файл. Файл не открывается при импорте: обработчик
+# создаётся с delay=True и открывает его только при первой записи
+DEFAULT_LOG_FILE = "currency.log"
+
 file_logger = logging.getLogger("currency_file")
-file_handler = logging.FileHandler("currency.log", encoding="utf-8")
-file_formatter = logging.Formatter("%(levelname)s: %(message)s")
-file_handler.setFormatter(file_formatter)
-file_logger.addHandler(file_handler)
-file_logger.setLevel(logging.INFO)
+file_handler: Optional[logging.Handler] = None
+
+
+def setup_file_logger(path: Optional[str] = None, level: Optional[str] = None) -> logging.Logger:
+    """
+    (Пере)настраивает file_logger.
+
+    Параметры:
+        path  — файл лога; по умолчанию переменная окружения LOGTOOLS_FILE,
+                иначе currency.log. Пустая строка — не писать в файл
+                и не логировать вовсе (level игнорируется)
+        level — уровень ("INFO", "ERROR", ...); по умолчанию LOGTOOLS_LEVEL или INFO
+
+    Файл открывается лениво, при первой записи в лог.
+    """
+    global file_handler
+
+    if path is None:
+        path = os.environ.get("LOGTOOLS_FILE", DEFAULT_LOG_FILE)
+    if level is None:
+        level = os.environ.get("LOGTOOLS_LEVEL", "INFO")
+
+    if file_handler is not None:
+        file_logger.removeHandler(file_handler)
+        file_handler.close()
+        file_handler = None
+
+    if path:
+        file_handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+        file_handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        file_logger.addHandler(file_handler)
+        file_logger.propagate = True
+        file_logger.setLevel(level.upper())
+    else:
+        # Лог выключен: уровень выше CRITICAL — trace не форматирует аргументы,
+        # а NullHandler без распространения не даёт записям уйти
+        # в logging.lastResort (stderr)
+        file_handler = logging.NullHandler()
+        file_logger.addHandler(file_handler)
+        file_logger.propagate = False
+        file_logger.setLevel(logging.CRITICAL + 1)
+
+    return file_logger
+
+
+setup_file_logger()
@@ -0,0 +1,227 @@
+"""
+Потоковое решение квадратных уравнений «файл → файл» на пуле процессов.
+
+Входной файл читается кусками по chunk_size строк, каждый кусок решается
+solve_quadratic_batch в отдельном процессе, результаты пишутся в выходной
+файл строго в исходном порядке. В памяти одновременно не больше
+max_pending кусков, поэтому размер файла не ограничен памятью.
+
+Форматы (по расширению или явно):
+    csv — вход: строки "a,b,c" (заголовок и пустые строки пропускаются);
+          выход: строки "x1,x2,status"
+    bin — вход: подряд идущие тройки float64 (a, b, c);
+          выход: записи OUTPUT_DTYPE (x1 float64, x2 float64, status int8)
+
+Коды status — QUAD_* из solver_quad_batch плюс QUAD_PARSE_ERROR для строк CSV,
+которые не удалось разобрать.
+
+Запуск:
+    python quad_stream.py coeffs.csv roots.csv --chunk-size 100000 --workers 8
+"""
+import io
+import os
+import sys
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import logtools
+from solver_quad_batch import (solve_quadratic_batch, QUAD_OK, QUAD_A_ZERO,
+                               QUAD_NEGATIVE_DISCRIMINANT, QUAD_NOT_FINITE, QUAD_OVERFLOW)
+
+
+QUAD_PARSE_ERROR = 5   # строка CSV не разобрана — корни NaN
+
+_STATUS_NAMES = {
+    QUAD_OK: "ok",
+    QUAD_A_ZERO: "a_zero",
+    QUAD_NEGATIVE_DISCRIMINANT: "negative_discriminant",
+    QUAD_NOT_FINITE: "not_finite",
+    QUAD_OVERFLOW: "overflow",
+    QUAD_PARSE_ERROR: "parse_error",
+}
+
+INPUT_DTYPE = np.dtype("<f8")
+OUTPUT_DTYPE = np.dtype([("x1", "<f8"), ("x2", "<f8"), ("status", "i1")])
+
+
+def _format_for(path: str, fmt: Optional[str]) -> str:
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "bin"
+    if fmt not in ("csv", "bin"):
+        raise ValueError("Формат должен быть 'csv' или 'bin'")
+    return fmt
+
+
+def _init_worker() -> None:
+    # В рабочих процессах trace не нужен: он писал бы по записи на кусок в лог
+    logtools.set_enabled(False)
+
+
+def _parse_csv(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Коэффициенты куска CSV и маска строк, которые не удалось разобрать."""
+    try:
+        coefficients = np.loadtxt(lines, delimiter=",", dtype=np.float64, ndmin=2)
+        if coefficients.shape == (len(lines), 3):
+            return coefficients, np.zeros(len(lines), dtype=bool)
+    except ValueError:
+        pass
+
+    # Медленный путь: в куске есть испорченные строки — разбираем построчно
+    coefficients = np.full((len(lines), 3), np.nan)
+    bad = np.zeros(len(lines), dtype=bool)
+    for i, line in enumerate(lines):
+        try:
+            values = [float(part) for part in line.split(",")]
+            if len(values) != 3:
+                raise ValueError(line)
+            coefficients[i] = values
+        except ValueError:
+            bad[i] = True
+    return coefficients, bad
+
+
+def _is_header(line: str) -> bool:
+    try:
+        [float(part) for part in line.split(",")]
+    except ValueError:
+        return all(not part.strip() or part.strip()[0].isalpha() for part in line.split(","))
+    return False
+
+
+def _solve_chunk(in_fmt: str, out_fmt: str, payload) -> Tuple[bytes, np.ndarray]:
+    """Решает один кусок; возвращает закодированный результат и счётчики статусов."""
+    if in_fmt == "csv":
+        coefficients, bad = _parse_csv(payload)
+    else:
+        coefficients = np.frombuffer(payload, dtype=INPUT_DTYPE).reshape(-1, 3)
+        bad = np.zeros(len(coefficients), dtype=bool)
+
+    x1, x2, status = solve_quadratic_batch(coefficients[:, 0], coefficients[:, 1],
+                                           coefficients[:, 2])
+    status[bad] = QUAD_PARSE_ERROR
+    counts = np.bincount(status, minlength=QUAD_PARSE_ERROR + 1)
+
+    if out_fmt == "csv":
+        buffer = io.StringIO()
+        np.savetxt(buffer, np.column_stack([x1, x2, status]), fmt="%.17g,%.17g,%d")
+        return buffer.getvalue().encode("ascii"), counts
+
+    records = np.empty(len(status), dtype=OUTPUT_DTYPE)
+    records["x1"], records["x2"], records["status"] = x1, x2, status
+    return records.tobytes(), counts
+
+
+def _read_chunks(path: str, fmt: str, chunk_size: int) -> Iterator[object]:
+    if fmt == "csv":
+        with open(path, encoding="utf-8") as f:
+            first = True
+            while True:
+                raw = list(itertools.islice(f, chunk_size))
+                if not raw:
+                    return
+                lines = [line for line in raw if line.strip()]
+                if first and lines and _is_header(lines[0]):
+                    lines = lines[1:]
+                first = False
+                if lines:
+                    yield lines
+    else:
+        row_bytes = 3 * INPUT_DTYPE.itemsize
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(chunk_size * row_bytes)
+                if not data:
+                    return
+                if len(data) % row_bytes:
+                    raise ValueError("Размер бинарного файла не кратен тройке float64")
+                yield data
+
+
+def solve_file(input_path: str, output_path: str,
+               chunk_size: int = 100_000,
+               workers: Optional[int] = None,
+               input_format: Optional[str] = None,
+               output_format: Optional[str] = None,
+               max_pending: Optional[int] = None,
+               progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """
+    Решает все уравнения из input_path и пишет корни в output_path по порядку.
+
+    Параметры:
+        chunk_size    : строк в одном куске
+        workers       : число процессов (по умолчанию — все ядра)
+        input_format  : "csv" или "bin" (по умолчанию — по расширению файла)
+        output_format : "csv" или "bin" (по умолчанию — по расширению файла)
+        max_pending   : сколько кусков может быть в работе одновременно
+                        (по умолчанию 2 × workers) — ограничивает память
+        progress      : функция, которой после каждого записанного куска
+                        передаётся число обработанных строк
+
+    Возвращает:
+        {"rows": всего строк, "ok": ..., "a_zero": ..., "negative_discriminant": ...,
+         "not_finite": ..., "overflow": ..., "parse_error": ...}
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным")
+
+    in_fmt = _format_for(input_path, input_format)
+    out_fmt = _format_for(output_path, output_format)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+
+    counts = np.zeros(QUAD_PARSE_ERROR + 1, dtype=np.int64)
+    rows = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, \
+            open(output_path, "wb") as out:
+        pending = deque()
+
+        def write_next() -> None:
+            nonlocal rows
+            data, chunk_counts = pending.popleft().result()
+            out.write(data)
+            counts[:len(chunk_counts)] += chunk_counts
+            rows += int(chunk_counts.sum())
+            if progress is not None:
+                progress(rows)
+
+        for payload in _read_chunks(input_path, in_fmt, chunk_size):
+            pending.append(pool.submit(_solve_chunk, in_fmt, out_fmt, payload))
+            if len(pending) >= max_pending:
+                write_next()
+        while pending:
+            write_next()
+
+    summary = {"rows": rows}
+    summary.update({name: int(counts[code]) for code, name in _STATUS_NAMES.items()})
+    return summary
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Решение квадратных уравнений из файла")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--input-format", choices=("csv", "bin"))
+    parser.add_argument("--output-format", choices=("csv", "bin"))
+    args = parser.parse_args()
+
+    def report(done: int) -> None:
+        print(f"\rОбработано строк: {done}", end="", file=sys.stderr, flush=True)
+
+    summary = solve_file(args.input, args.output, args.chunk_size, args.workers,
+                         args.input_format, args.output_format, progress=report)
+    print(file=sys.stderr)
+    for name, value in summary.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
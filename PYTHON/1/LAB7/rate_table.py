@@ -0,0 +1,144 @@
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+from cbr_rates import DEFAULT_URL, _get_valute
+from rates_cache import RatesCache, ValidatorStore
+from cbr_client import CbrClient
+
+
+Codes = Union[str, Sequence[str], np.ndarray]
+
+
+class RateTable:
+    """
+    Таблица курсов ЦБ на массивах NumPy для векторной конвертации.
+
+    Хранит отображение код → индекс и массив float64 курсов в рублях
+    за одну единицу валюты (Value / Nominal). Рубль (base) добавляется
+    с курсом 1.0, так что конвертация в рубли и из рублей тоже работает.
+
+    Параметры:
+        codes : коды валют
+        rates : курсы в рублях за единицу валюты, в том же порядке
+    """
+
+    BASE = "RUB"
+
+    def __init__(self, codes: List[str], rates: Sequence[float]) -> None:
+        rates = np.asarray(rates, dtype=np.float64)
+        if len(codes) != len(rates):
+            raise ValueError("Число кодов валют не совпадает с числом курсов")
+        if not np.all(rates > 0):
+            raise ValueError("Курсы валют должны быть положительными")
+
+        self.codes = list(codes)
+        self.rates = rates
+        self.index: Dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+
+    def __repr__(self) -> str:
+        return f"RateTable({len(self.codes)} валют)"
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.index
+
+    @classmethod
+    def from_valute(cls, valute_data: Dict[str, Any]) -> "RateTable":
+        """
+        Строит таблицу из словаря "Valute" ответа API ЦБ.
+
+        Исключения:
+            KeyError   — у валюты нет поля "Value"
+            TypeError  — курс или номинал имеет неправильный тип
+            ValueError — номинал не положителен
+        """
+        codes = [cls.BASE]
+        rates = [1.0]
+
+        for code, record in valute_data.items():
+            if "Value" not in record:
+                raise KeyError(f"В данных валюты '{code}' отсутствует поле 'Value'")
+
+            value = record["Value"]
+            nominal = record.get("Nominal", 1)
+
+            if not isinstance(value, (int, float)):
+                raise TypeError(f"Некорректный тип курса валюты '{code}'")
+            if not isinstance(nominal, (int, float)):
+                raise TypeError(f"Некорректный тип номинала валюты '{code}'")
+            if nominal <= 0:
+                raise ValueError(f"Номинал валюты '{code}' должен быть положительным")
+
+            codes.append(code)
+            rates.append(value / nominal)
+
+        return cls(codes, rates)
+
+    def indices(self, codes: Codes) -> Union[int, np.ndarray]:
+        """
+        Индексы валют в таблице: для строки — число, для массива — массив того же вида.
+
+        Поиск по словарю делается только для уникальных кодов, а не для каждого элемента.
+        KeyError — если какой-то валюты нет в таблице.
+        """
+        if isinstance(codes, str):
+            if codes not in self.index:
+                raise KeyError(f"Валюта '{codes}' отсутствует в данных ЦБ")
+            return self.index[codes]
+
+        codes = np.asarray(codes)
+        if codes.dtype.kind in "iu":
+            # Уже индексы — проверяем только границы
+            if codes.size and (codes.min() < 0 or codes.max() >= len(self.codes)):
+                raise KeyError("Индекс валюты вне таблицы")
+            return codes
+
+        unique, inverse = np.unique(codes, return_inverse=True)
+        missing = [code for code in unique.tolist() if code not in self.index]
+        if missing:
+            raise KeyError(f"Валюта '{missing[0]}' отсутствует в данных ЦБ")
+
+        positions = np.fromiter((self.index[code] for code in unique.tolist()),
+                                dtype=np.intp, count=len(unique))
+        return positions[inverse].reshape(codes.shape)
+
+    def rate(self, from_code: str, to_code: str) -> float:
+        """Кросс-курс: сколько единиц to_code стоит одна единица from_code."""
+        return float(self.rates[self.indices(from_code)] / self.rates[self.indices(to_code)])
+
+    def convert(self, amounts: Union[float, Sequence[float], np.ndarray],
+                from_codes: Codes, to_codes: Codes) -> np.ndarray:
+        """
+        Векторная конвертация сумм между валютами за один проход.
+
+        Параметры:
+            amounts    : суммы (число или массив)
+            from_codes : исходные валюты — один код, массив кодов или индексов
+            to_codes   : целевые валюты — один код, массив кодов или индексов
+
+        Возвращает:
+            массив float64 сконвертированных сумм (по правилам broadcasting NumPy)
+
+        Исключения:
+            KeyError — валюты нет в таблице
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        from_rates = self.rates[self.indices(from_codes)]
+        to_rates = self.rates[self.indices(to_codes)]
+        return amounts * (from_rates / to_rates)
+
+
+def get_rate_table(url: str = DEFAULT_URL,
+                   cache: Optional[RatesCache] = None,
+                   client: Optional[CbrClient] = None,
+                   validators: Optional[ValidatorStore] = None) -> RateTable:
+    """
+    Получает полную таблицу курсов ЦБ как RateTable.
+
+    Параметры cache, client и validators — как у cbr_rates.get_currencies.
+    Исключения: ConnectionError, ValueError, KeyError, TypeError — как у get_currencies.
+    """
+    return RateTable.from_valute(_get_valute(url, cache, client, validators))
@@ -0,0 +1,276 @@
+import os
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class RatesCache:
+    """
+    Кэш распарсенных ответов API ЦБ (словарь "Valute"), ключ — URL.
+
+    Два уровня:
+        • память — LRU на OrderedDict, не больше maxsize записей
+        • диск (необязательно) — каталог path, по JSON-файлу на URL,
+          переживает перезапуск процесса; JSON, а не pickle, — чтение
+          чужого файла из каталога не может выполнить код
+
+    Запись считается свежей ttl секунд с момента сохранения.
+    Попадание в кэш не делает ни сетевого запроса, ни разбора JSON.
+
+    Параметры:
+        ttl     — время жизни записи в секундах
+        maxsize — размер LRU в памяти
+        path    — каталог для дискового уровня (None — только память)
+    """
+
+    def __init__(self, ttl: float = 3600.0, maxsize: int = 32,
+                 path: Optional[str] = None) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl должен быть положительным")
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным")
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = path
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Счётчики
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"RatesCache(ttl={self.ttl}, maxsize={self.maxsize}, path={self.path!r})"
+
+    def _file_for(self, url: str) -> str:
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{name}.json")
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl
+
+    def _read_disk(self, url: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        try:
+            with open(self._file_for(url), encoding="utf-8") as f:
+                entry = json.load(f)
+            stored_at, stored_url, valute = entry["stored_at"], entry["url"], entry["valute"]
+            if not isinstance(stored_at, (int, float)) or not isinstance(valute, dict):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # Нет файла или он повреждён — считаем промахом
+            return None
+
+        # Защита от коллизии имени файла
+        if stored_url != url:
+            return None
+        return stored_at, valute
+
+    def _write_disk(self, url: str, stored_at: float, valute: Dict[str, Any]) -> None:
+        target = self._file_for(url)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "url": url, "valute": valute}, f,
+                          ensure_ascii=False)
+            # Атомарная замена: читатель никогда не увидит полузаписанный файл
+            os.replace(tmp, target)
+        except OSError:
+            # Диск — лишь дополнительный уровень, ошибка записи не критична
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _store_memory(self, url: str, stored_at: float, valute: Dict[str, Any]) -> None:
+        self._memory[url] = (stored_at, valute)
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, url: str, count_miss: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает сохранённый "Valute" для url или None, если записи нет или она устарела.
+        count_miss=False — повторная проверка, промах не учитывается в счётчиках.
+        """
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                if self._is_fresh(entry[0]):
+                    self._memory.move_to_end(url)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[url]
+
+        # Файл читается без блокировки: промах по одному URL не задерживает
+        # потоки, работающие с другими
+        entry = self._read_disk(url) if self.path is not None else None
+
+        with self._lock:
+            if entry is not None and self._is_fresh(entry[0]):
+                # Поднимаем запись с диска в память, если другой поток
+                # не успел положить туда более свежую
+                current = self._memory.get(url)
+                if current is None or current[0] < entry[0]:
+                    self._store_memory(url, entry[0], entry[1])
+                self.hits += 1
+                self.disk_hits += 1
+                return entry[1]
+
+            if count_miss:
+                self.misses += 1
+            return None
+
+    def put(self, url: str, valute: Dict[str, Any]) -> None:
+        """Сохраняет распарсенный "Valute" для url в память и, если задан path, на диск."""
+        stored_at = time.time()
+        with self._lock:
+            self._store_memory(url, stored_at, valute)
+        if self.path is not None:
+            self._write_disk(url, stored_at, valute)
+
+    def clear(self) -> None:
+        """Очищает уровень в памяти и сбрасывает счётчики (файлы на диске не трогает)."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики попаданий, промахов и вытеснений."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._memory),
+            }
+
+
+class ValidatorStore:
+    """
+    Хранилище валидаторов для условных запросов (ETag / Last-Modified).
+
+    Для каждого URL помнит ETag, Last-Modified и уже распарсенный "Valute".
+    Если сервер ответил 304 Not Modified, get_currencies берёт "Valute"
+    отсюда, не скачивая и не разбирая документ заново.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[Optional[str], Optional[str], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.modified = 0
+
+    def __repr__(self) -> str:
+        return f"ValidatorStore(urls={len(self._entries)})"
+
+    def headers(self, url: str) -> Dict[str, str]:
+        """Заголовки условного запроса для url (пусто, если валидаторов ещё нет)."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def reuse(self, url: str) -> Optional[Dict[str, Any]]:
+        """Сохранённый "Valute" для ответа 304 (None, если его нет)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self.not_modified += 1
+            return entry[2]
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              valute: Dict[str, Any]) -> None:
+        """Запоминает валидаторы и "Valute" из полного ответа 200."""
+        with self._lock:
+            self.modified += 1
+            if etag or last_modified:
+                self._entries[url] = (etag, last_modified, valute)
+            else:
+                # Сервер не дал валидаторов — условный запрос невозможен
+                self._entries.pop(url, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики ответов 304 и 200."""
+        with self._lock:
+            return {"not_modified": self.not_modified, "modified": self.modified,
+                    "size": len(self._entries)}
+
+
+class SingleFlight:
+    """
+    Схлопывание одновременных одинаковых запросов (single-flight).
+
+    Пока для ключа выполняется вызов, остальные потоки с тем же ключом
+    не запускают свой, а ждут его и получают тот же результат или то же
+    исключение. После завершения ключ освобождается — следующий вызов
+    снова пойдёт в сеть (или в кэш).
+    """
+
+    class _Call:
+        def __init__(self) -> None:
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self) -> None:
+        self._calls: Dict[Any, "SingleFlight._Call"] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def __repr__(self) -> str:
+        return f"SingleFlight(in_flight={len(self._calls)})"
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        """Выполняет fn() для key или присоединяется к уже идущему вызову."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Число реальных вызовов и число присоединившихся к чужому вызову."""
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared}
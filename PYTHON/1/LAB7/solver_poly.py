@@ -0,0 +1,263 @@
+from typing import Tuple
+
+import numpy as np
+
+from logtools import trace, file_logger
+from trace_render import bounded_repr
+
+
+# Коды состояния строк — те же значения, что у solve_quadratic_batch
+POLY_OK = 0
+POLY_CONSTANT = 1        # все коэффициенты при x равны нулю — корней нет
+POLY_COMPLEX_ROOTS = 2   # в вещественном режиме часть корней комплексные (они NaN)
+POLY_NOT_FINITE = 3      # среди коэффициентов есть NaN или бесконечность
+
+MAX_DEGREE = 4
+
+# Корни из единицы третьей степени для формулы Кардано
+_OMEGA = np.exp(2j * np.pi * np.arange(3) / 3)
+
+# Допустимая относительная невязка |p(x)| / Σ|c_i||x|^i после уточнения;
+# строки хуже этого решаются заново через собственные числа сопровождающей матрицы
+RESIDUAL_TOL = 1e-10
+
+# Корни ближе COINCIDE_TOL (относительно модуля) считаются совпавшими; совпадение
+# допустимо только для кратного корня, где относительное |p'(x)| меньше MULTIPLE_TOL
+COINCIDE_TOL = 1e-3
+MULTIPLE_TOL = 1e-4
+
+
+def _linear(c: np.ndarray) -> np.ndarray:
+    return (-c[:, 1] / c[:, 0])[:, None]
+
+
+def _quadratic(c: np.ndarray) -> np.ndarray:
+    a, b, k = c[:, 0], c[:, 1], c[:, 2]
+    sqrt_d = np.sqrt(b * b - 4 * a * k)
+    # Устойчивая формула: выбираем знак, при котором нет вычитания близких чисел
+    sign = np.where((b.conj() * sqrt_d).real >= 0, 1.0, -1.0)
+    q = -0.5 * (b + sign * sqrt_d)
+    safe_q = np.where(q == 0, 1.0, q)
+    x1 = q / a
+    x2 = np.where(q == 0, 0.0, k / safe_q)
+    return np.stack([x1, x2], axis=1)
+
+
+def _depressed_cubic(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Корни t^3 + p t + q = 0 по формуле Кардано (комплексная арифметика)."""
+    root = np.sqrt(q * q / 4 + p * p * p / 27)
+    u3 = -q / 2 + root
+    # Берём слагаемое с большим модулем, чтобы не делить на ноль
+    u3 = np.where(np.abs(u3) >= np.abs(-q / 2 - root), u3, -q / 2 - root)
+    u = u3 ** (1 / 3)
+
+    uk = u[:, None] * _OMEGA[None, :]
+    safe_uk = np.where(uk == 0, 1.0, uk)
+    return np.where(uk == 0, 0.0, uk - p[:, None] / (3 * safe_uk))
+
+
+def _cubic(c: np.ndarray) -> np.ndarray:
+    a, b, k = c[:, 1] / c[:, 0], c[:, 2] / c[:, 0], c[:, 3] / c[:, 0]
+    p = b - a * a / 3
+    q = 2 * a ** 3 / 27 - a * b / 3 + k
+    return _depressed_cubic(p, q) - (a / 3)[:, None]
+
+
+def _quartic(c: np.ndarray) -> np.ndarray:
+    a, b, k, e = (c[:, i] / c[:, 0] for i in range(1, 5))
+
+    # Подстановка x = y - a/4: y^4 + p y^2 + q y + r = 0
+    p = b - 3 * a * a / 8
+    q = a ** 3 / 8 - a * b / 2 + k
+    r = -3 * a ** 4 / 256 + a * a * b / 16 - a * k / 4 + e
+
+    # Резольвента Феррари: 8m^3 + 8p m^2 + (2p^2 - 8r) m - q^2 = 0,
+    # берём корень с наибольшим модулем (он ненулевой, если q != 0)
+    res = np.stack([np.full_like(p, 8), 8 * p, 2 * p * p - 8 * r, -q * q], axis=1)
+    m_all = _cubic(res)
+    m = m_all[np.arange(len(m_all)), np.argmax(np.abs(m_all), axis=1)]
+
+    biquadratic = m == 0
+    safe_m = np.where(biquadratic, 1.0, m)
+    sqrt_2m = np.sqrt(2 * safe_m)
+
+    roots = []
+    for s1 in (1, -1):
+        inner = np.sqrt(-(2 * p + 2 * safe_m + s1 * np.sqrt(2) * q / np.sqrt(safe_m)))
+        for s2 in (1, -1):
+            roots.append((s1 * sqrt_2m + s2 * inner) / 2)
+    y = np.stack(roots, axis=1)
+
+    # q == 0 и m == 0: y^4 + p y^2 + r = 0 — квадратное уравнение относительно y^2
+    if biquadratic.any():
+        z = _quadratic(np.stack([np.ones_like(p[biquadratic]), p[biquadratic],
+                                 r[biquadratic]], axis=1))
+        sz = np.sqrt(z)
+        y[biquadratic] = np.concatenate([sz, -sz], axis=1)
+
+    return y - (a / 4)[:, None]
+
+
+_SOLVERS = {1: _linear, 2: _quadratic, 3: _cubic, 4: _quartic}
+
+
+def _scaled(c: np.ndarray) -> tuple:
+    """
+    Приводит многочлены к виду со старшим коэффициентом 1 и корнями порядка
+    единицы: x = s·y, где s = max |c_i / c_0|^(1/i) — оценка сверху модуля
+    корней. Формулы Кардано и Феррари на таких коэффициентах не переполняются
+    и не теряют точность из-за разброса порядков.
+    """
+    degree = c.shape[1] - 1
+    powers = np.arange(1, degree + 1)
+    ratios = np.abs(c[:, 1:] / c[:, :1])
+    scale = np.max(ratios ** (1.0 / powers), axis=1)
+    scale = np.where((scale > 0) & np.isfinite(scale), scale, 1.0)
+    monic = np.empty_like(c)
+    monic[:, 0] = 1.0
+    monic[:, 1:] = c[:, 1:] / c[:, :1] / scale[:, None] ** powers
+    return monic, scale
+
+
+def _residual(c: np.ndarray, roots: np.ndarray) -> np.ndarray:
+    """Относительная невязка |p(x)| / Σ|c_i||x|^i для каждого корня."""
+    value = np.zeros_like(roots)
+    bound = np.zeros(roots.shape)
+    modulus = np.abs(roots)
+    for i in range(c.shape[1]):
+        value = value * roots + c[:, i:i + 1]
+        bound = bound * modulus + np.abs(c[:, i:i + 1])
+    return np.abs(value) / np.where(bound == 0, 1.0, bound)
+
+
+def _collapsed(c: np.ndarray, roots: np.ndarray) -> np.ndarray:
+    """
+    Маска строк, где несколько корней совпали, хотя корень не кратный:
+    шаги Ньютона могут стянуть соседние приближения к одному корню, и тогда
+    невязка каждого корня мала, а часть корней потеряна.
+    """
+    degree = c.shape[1] - 1
+    if degree < 2:
+        return np.zeros(len(c), dtype=bool)
+
+    derivative = c[:, :-1] * np.arange(degree, 0, -1)
+    slope = _residual(derivative, roots)
+
+    distance = np.abs(roots[:, :, None] - roots[:, None, :])
+    size = np.maximum(np.abs(roots)[:, :, None], np.abs(roots)[:, None, :])
+    close = (distance <= COINCIDE_TOL * size) & ~np.eye(degree, dtype=bool)
+    return (close & (slope > MULTIPLE_TOL)[:, :, None]).any(axis=(1, 2))
+
+
+def _companion(c: np.ndarray) -> np.ndarray:
+    """Корни как собственные числа сопровождающих матриц (как numpy.roots), пачкой."""
+    degree = c.shape[1] - 1
+    matrix = np.zeros((len(c), degree, degree), dtype=np.complex128)
+    matrix[:, 0, :] = -c[:, 1:] / c[:, :1]
+    matrix[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+    return np.linalg.eigvals(matrix)
+
+
+def _solve_degree(c: np.ndarray, solver) -> np.ndarray:
+    """
+    Корни многочленов одной степени: формула на масштабированных коэффициентах,
+    уточнение Ньютоном и проверка невязки каждого корня и набора в целом
+    (нет ложно совпавших корней); строки, не прошедшие проверку (плохо
+    обусловленные — корни очень разных порядков), решаются заново через
+    сопровождающую матрицу — без уточнения, чтобы не стянуть корни снова.
+    """
+    monic, scale = _scaled(c)
+    roots = _polish(c, solver(monic) * scale[:, None])
+
+    bad = ~(_residual(c, roots) <= RESIDUAL_TOL).all(axis=1) | _collapsed(c, roots)
+    if bad.any():
+        roots[bad] = _companion(c[bad])
+    return roots
+
+
+def _polish(c: np.ndarray, roots: np.ndarray, iterations: int = 2) -> np.ndarray:
+    """Несколько шагов Ньютона по исходному многочлену — уточняют корни формул."""
+    degree = c.shape[1] - 1
+    derivative = c[:, :-1] * np.arange(degree, 0, -1)
+    for _ in range(iterations):
+        value = np.zeros_like(roots)
+        slope = np.zeros_like(roots)
+        for i in range(degree + 1):
+            value = value * roots + c[:, i:i + 1]
+        for i in range(degree):
+            slope = slope * roots + derivative[:, i:i + 1]
+        step = np.where(slope != 0, value / np.where(slope == 0, 1.0, slope), 0.0)
+        candidate = roots - step
+        # Принимаем шаг, только если он не ухудшил невязку (кратные корни)
+        new_value = np.zeros_like(roots)
+        for i in range(degree + 1):
+            new_value = new_value * candidate + c[:, i:i + 1]
+        better = np.isfinite(candidate) & (np.abs(new_value) <= np.abs(value))
+        roots = np.where(better, candidate, roots)
+    return roots
+
+
+@trace(handle=file_logger, render=bounded_repr)
+def solve_poly_batch(coefficients, complex_roots: bool = False, real_tol: float = 1e-7
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Векторное решение многочленов степени 1–4 в замкнутой форме.
+
+    Параметры:
+        coefficients  : массив формы (n, k), k ≤ 5 — коэффициенты от старшей
+                        степени к свободному члену, как у numpy.roots. Ведущие
+                        нули понижают степень строки, так что в одном массиве
+                        можно смешивать линейные, квадратные, кубические
+                        и уравнения четвёртой степени
+        complex_roots : вернуть комплексные корни; иначе комплексные корни
+                        заменяются на NaN, а строка получает POLY_COMPLEX_ROOTS
+        real_tol      : относительный порог мнимой части, ниже которого корень
+                        считается вещественным
+
+    Возвращает:
+        (roots, degree, status): roots — массив (n, 4), лишние места NaN;
+        degree — степень каждой строки; status — коды POLY_OK, POLY_CONSTANT,
+        POLY_COMPLEX_ROOTS, POLY_NOT_FINITE (вместо исключений).
+
+    Строки одной степени решаются вместе: коэффициенты масштабируются,
+    линейные решаются делением, квадратные — устойчивой формулой, кубические —
+    Кардано, четвёртой степени — Феррари; затем корни уточняются двумя шагами
+    Ньютона. Строки, где относительная невязка всё ещё больше RESIDUAL_TOL
+    (корни сильно разных порядков), пересчитываются через собственные числа
+    сопровождающей матрицы, как в numpy.roots.
+    """
+    c = np.asarray(coefficients, dtype=np.float64)
+    if c.ndim == 1:
+        c = c[None, :]
+    if c.ndim != 2 or not 2 <= c.shape[1] <= MAX_DEGREE + 1:
+        raise ValueError("Ожидается массив формы (n, k), где 2 <= k <= 5")
+
+    n, width = c.shape
+    status = np.full(n, POLY_OK, dtype=np.int8)
+    roots = np.full((n, MAX_DEGREE), np.nan + 0j)
+
+    finite = np.isfinite(c).all(axis=1)
+    status[~finite] = POLY_NOT_FINITE
+
+    # Степень строки — по первому ненулевому коэффициенту
+    nonzero = c[:, :-1] != 0
+    degree = np.where(nonzero.any(axis=1), width - 1 - nonzero.argmax(axis=1), 0).astype(np.int8)
+    status[finite & (degree == 0)] = POLY_CONSTANT
+
+    for deg, solver in _SOLVERS.items():
+        rows = np.nonzero(finite & (degree == deg))[0]
+        if not len(rows):
+            continue
+        sub = c[rows, width - 1 - deg:].astype(np.complex128)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            found = _solve_degree(sub, solver)
+        roots[rows, :deg] = found
+
+    if complex_roots:
+        return roots, degree, status
+
+    real = np.abs(roots.imag) <= real_tol * np.maximum(1.0, np.abs(roots.real))
+    result = np.where(real, roots.real, np.nan)
+    has_complex = (~real & ~np.isnan(roots)).any(axis=1)
+    status[has_complex & (status == POLY_OK)] = POLY_COMPLEX_ROOTS
+    return result, degree, status
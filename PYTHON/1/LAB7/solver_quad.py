@@ -1,4 +1,8 @@
-from typing import Tuple
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
 from logtools import trace, file_logger
 
 
@@ -29,3 +33,113 @@ def solve_quadratic(a: float, b: float, c: float) -> Tuple[float, float]:
     x2 = (-b - sqrt_d) / (2 * a)
 
     return x1, x2
+
+
+class QuadraticCache:
+    """
+    Необязательная мемоизация solve_quadratic: LRU на OrderedDict,
+    не больше maxsize записей.
+
+    Кэшируется и результат, и ошибка: повторный вызов с теми же
+    коэффициентами снова выбрасывает ValueError того же типа и текста,
+    не вызывая решатель. Попадание не проходит через trace, поэтому
+    не тратит время ни на вычисление, ни на форматирование лога.
+
+    Ключ — коэффициенты, приведённые к float, так что (1, -3, 2)
+    и (1.0, -3.0, 2.0) делят одну запись. Не кэшируются нечисловые
+    аргументы, NaN и бесконечности, а также целые, которые нельзя
+    точно представить float, — такие вызовы идут в решатель напрямую.
+
+    Параметры:
+        maxsize — размер LRU
+        solver  — функция (a, b, c) -> (x1, x2), по умолчанию solve_quadratic
+    """
+
+    def __init__(self, maxsize: int = 1024, solver: Optional[Callable] = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным")
+
+        self.maxsize = maxsize
+        self.solver = solver or solve_quadratic
+
+        self._entries: "OrderedDict[Tuple[float, float, float], Tuple[bool, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Счётчики
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncached = 0
+
+    def __repr__(self) -> str:
+        return f"QuadraticCache(maxsize={self.maxsize})"
+
+    @staticmethod
+    def _key(a, b, c) -> Optional[Tuple[float, float, float]]:
+        key = []
+        for value in (a, b, c):
+            if type(value) not in (int, float):
+                return None
+            try:
+                number = float(value)
+            except OverflowError:
+                return None
+            if not math.isfinite(number) or number != value:
+                return None
+            key.append(number)
+        return tuple(key)
+
+    def __call__(self, a, b, c) -> Tuple[float, float]:
+        key = self._key(a, b, c)
+        if key is None:
+            with self._lock:
+                self.uncached += 1
+            return self.solver(a, b, c)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            # Решатель вызывается вне блокировки: параллельные промахи
+            # по одному ключу просто посчитают его дважды
+            try:
+                entry = (True, self.solver(a, b, c))
+            except ValueError as e:
+                entry = (False, (type(e), e.args))
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        ok, value = entry
+        if ok:
+            return value
+        error_type, args = value
+        # Новый экземпляр — чтобы не копить трассировки в одном объекте
+        raise error_type(*args)
+
+    def clear(self) -> None:
+        """Очищает кэш и сбрасывает счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.uncached = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Счётчики попаданий, промахов, вытеснений и доля попаданий."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "uncached": self.uncached,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,97 @@
+from typing import Tuple
+
+import numpy as np
+
+from logtools import trace, file_logger
+from trace_render import bounded_repr
+
+
+# Коды состояния строк в solve_quadratic_batch
+QUAD_OK = 0
+QUAD_A_ZERO = 1                 # a == 0 — уравнение не квадратное
+QUAD_NEGATIVE_DISCRIMINANT = 2  # D < 0 — вещественных корней нет
+QUAD_NOT_FINITE = 3             # среди коэффициентов есть NaN или бесконечность
+QUAD_OVERFLOW = 4               # коэффициенты конечны, но корень не помещается в float64
+
+
+_NO_EXPONENT = -100000
+
+
+def _ldexp(x: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """x · 2^k без промежуточного переполнения 2^k, в том числе для комплексных x."""
+    if np.iscomplexobj(x):
+        return _ldexp(x.real, k) + 1j * _ldexp(x.imag, k)
+    return np.ldexp(x, k)
+
+
+@trace(handle=file_logger, render=bounded_repr)
+def solve_quadratic_batch(a, b, c, complex_roots: bool = False
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Векторное решение множества уравнений a[i]x^2 + b[i]x + c[i] = 0 за один проход.
+
+    Параметры:
+        a, b, c       : массивы коэффициентов (или числа; приводятся по правилам broadcasting)
+        complex_roots : вернуть комплексные корни для строк с D < 0
+
+    Возвращает:
+        (x1, x2, status): x1 и x2 — корни в том же порядке, что у solve_quadratic
+        (x1 — со знаком «+» перед корнем из D); status — массив int8 с кодами
+        QUAD_OK, QUAD_A_ZERO, QUAD_NEGATIVE_DISCRIMINANT, QUAD_NOT_FINITE,
+        QUAD_OVERFLOW.
+        Вместо исключений у плохих строк корни равны NaN, а в режиме
+        complex_roots строки с D < 0 получают комплексные корни (статус
+        QUAD_NEGATIVE_DISCRIMINANT сохраняется).
+
+    Корни считаются устойчивой формулой q = -(b + sign(b)·√D) / 2,
+    x = q / a и x = c / q, без потери точности при b² ≫ 4ac. Перед этим
+    каждая строка точно масштабируется степенями двойки: x = 2^k·y, чтобы
+    |a·4^k| ≈ |c|, и все коэффициенты делятся на 2^e порядка наибольшего —
+    так D не переполняется и не теряется в денормалах. Если корень всё же
+    не помещается в float64, строка получает QUAD_OVERFLOW.
+    """
+    a, b, c = np.broadcast_arrays(np.asarray(a, dtype=np.float64),
+                                  np.asarray(b, dtype=np.float64),
+                                  np.asarray(c, dtype=np.float64))
+
+    status = np.full(a.shape, QUAD_OK, dtype=np.int8)
+    finite = np.isfinite(a) & np.isfinite(b) & np.isfinite(c)
+
+    with np.errstate(over="ignore", under="ignore", divide="ignore", invalid="ignore"):
+        # Двоичные порядки коэффициентов; у нуля — «минус бесконечность»
+        ea, eb, ec = (np.where(finite & (v != 0), np.frexp(v)[1], _NO_EXPONENT) for v in (a, b, c))
+        k = np.where((ea != _NO_EXPONENT) & (ec != _NO_EXPONENT), (ec - ea) // 2, 0)
+        e = np.maximum(np.maximum(ea + 2 * k, eb + k), ec)
+        e = np.where(e == _NO_EXPONENT, 0, e)
+        a_s, b_s, c_s = np.ldexp(a, 2 * k - e), np.ldexp(b, k - e), np.ldexp(c, -e)
+
+        d = b_s * b_s - 4.0 * a_s * c_s
+
+        status[d < 0] = QUAD_NEGATIVE_DISCRIMINANT
+        status[a == 0] = QUAD_A_ZERO
+        status[~finite] = QUAD_NOT_FINITE
+
+        if complex_roots:
+            sqrt_d = np.sqrt(d.astype(np.complex128))
+            solvable = (status == QUAD_OK) | (status == QUAD_NEGATIVE_DISCRIMINANT)
+        else:
+            sqrt_d = np.sqrt(np.where(d >= 0, d, 0.0))
+            solvable = status == QUAD_OK
+
+        sign = np.where(b >= 0, 1.0, -1.0)
+        q = -0.5 * (b_s + sign * sqrt_d)
+        root_q = _ldexp(q / a_s, k)
+        root_c = _ldexp(np.where(q == 0, 0.0, c_s / q), k)  # q == 0 только при b = c = 0
+
+    # При b >= 0 корень q/a соответствует «−√D», иначе «+√D»
+    positive_b = b >= 0
+    x1 = np.where(positive_b, root_c, root_q)
+    x2 = np.where(positive_b, root_q, root_c)
+
+    overflow = solvable & ~(np.isfinite(x1) & np.isfinite(x2))
+    status[overflow] = QUAD_OVERFLOW
+    solvable &= ~overflow
+
+    x1[~solvable] = np.nan
+    x2[~solvable] = np.nan
+    return x1, x2, status
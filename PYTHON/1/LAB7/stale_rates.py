@@ -0,0 +1,138 @@
+import time
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+from cbr_rates import DEFAULT_URL, _fetch_valute, _extract_rates, _flight_key, _inflight
+from rates_cache import ValidatorStore
+from cbr_client import CbrClient
+
+
+class StaleRates:
+    """
+    Курсы ЦБ в режиме stale-while-revalidate.
+
+    Запрос всегда обслуживается из последнего удачного снимка "Valute".
+    Если снимок старше max_age, его обновление запускается в фоновом
+    потоке, а вызывающий сразу получает старые данные. Ошибка обновления
+    не пробрасывается: снимок остаётся прежним, ошибка сохраняется в
+    last_error, а возраст данных доступен через age.
+
+    Только самый первый запрос (пока снимка нет) идёт в сеть синхронно
+    и может выбросить исключение.
+
+    Параметры:
+        url        : адрес API ЦБ
+        max_age    : возраст снимка в секундах, после которого он обновляется
+        client     : CbrClient для запросов (как в get_currencies)
+        validators : ValidatorStore для условных запросов (как в get_currencies)
+        retry_interval : пауза в секундах перед повторной попыткой после
+                         неудачного обновления
+    """
+
+    def __init__(self, url: str = DEFAULT_URL, max_age: float = 3600.0,
+                 client: Optional[CbrClient] = None,
+                 validators: Optional[ValidatorStore] = None,
+                 retry_interval: float = 30.0) -> None:
+        if max_age <= 0:
+            raise ValueError("max_age должен быть положительным")
+        if retry_interval < 0:
+            raise ValueError("retry_interval не может быть отрицательным")
+
+        self.url = url
+        self.max_age = max_age
+        self.client = client
+        self.validators = validators
+        self.retry_interval = retry_interval
+
+        self._valute: Optional[Dict[str, Any]] = None
+        self._fetched_at: Optional[float] = None
+        self._refreshing: Optional[threading.Thread] = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+        self.last_error: Optional[Exception] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return f"StaleRates(url={self.url!r}, max_age={self.max_age})"
+
+    @property
+    def age(self) -> Optional[float]:
+        """Возраст текущего снимка в секундах (None, если снимка ещё нет)."""
+        fetched_at = self._fetched_at
+        return None if fetched_at is None else time.monotonic() - fetched_at
+
+    @property
+    def is_stale(self) -> bool:
+        """Снимок старше max_age (или его нет)."""
+        age = self.age
+        return age is None or age >= self.max_age
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Синхронно обновляет снимок и возвращает новый "Valute".
+
+        Исключения: ConnectionError, ValueError, KeyError — как у get_currencies.
+        """
+        try:
+            valute_data = _inflight.do(
+                _flight_key(self.url, client=self.client, validators=self.validators),
+                lambda: _fetch_valute(self.url, self.client, self.validators))
+        except (ConnectionError, ValueError, KeyError) as exc:
+            with self._lock:
+                self.last_error = exc
+                self.failures += 1
+                self._next_attempt = time.monotonic() + self.retry_interval
+            raise
+
+        with self._lock:
+            self._valute = valute_data
+            self._fetched_at = time.monotonic()
+            self.last_error = None
+            self.refreshes += 1
+        return valute_data
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except (ConnectionError, ValueError, KeyError):
+            # Ошибка уже записана в last_error — продолжаем отдавать старый снимок
+            pass
+        finally:
+            with self._lock:
+                self._refreshing = None
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing is not None or time.monotonic() < self._next_attempt:
+                return
+            self._refreshing = threading.Thread(target=self._refresh_quietly,
+                                                name="cbr-rates-refresh", daemon=True)
+            self._refreshing.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Ждёт окончания фонового обновления, если оно идёт."""
+        thread = self._refreshing
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_with_age(self, currency_codes: List[str]) -> Tuple[Dict[str, float], float]:
+        """
+        Курсы и возраст снимка, из которого они взяты (секунды).
+
+        Исключения:
+            ConnectionError, ValueError — только если снимка ещё нет и первый запрос не удался
+            KeyError, TypeError         — как у get_currencies
+        """
+        valute_data = self._valute
+        if valute_data is None:
+            valute_data = self.refresh()
+        elif self.is_stale:
+            self._start_refresh()
+
+        return _extract_rates(valute_data, currency_codes), self.age
+
+    def get(self, currency_codes: List[str]) -> Dict[str, float]:
+        """Курсы валют, как у get_currencies, но без ожидания сети на устаревшем снимке."""
+        return self.get_with_age(currency_codes)[0]
@@ -1,7 +1,87 @@
+import asyncio
+import datetime
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 from io import StringIO
+from unittest import mock
+
+import numpy as np
+import requests
+
+import logtools
 from logtools import trace
-from solver_quad import solve_quadratic
+from log_sinks import QueuedSink
+from trace_metrics import MetricsRegistry
+from trace_sampling import Sampler
+from trace_render import BoundedRenderer, bounded_repr
+from trace_records import JsonlSink, BinarySink, iter_records, summarize, _BufferedSink
+import bench_import
+from solver_quad import solve_quadratic, QuadraticCache
+from solver_quad_batch import (solve_quadratic_batch, QUAD_OK, QUAD_A_ZERO,
+                               QUAD_NEGATIVE_DISCRIMINANT, QUAD_NOT_FINITE, QUAD_OVERFLOW)
+from solver_poly import (solve_poly_batch, POLY_OK, POLY_CONSTANT, POLY_COMPLEX_ROOTS,
+                         POLY_NOT_FINITE)
+from bench_poly import make_coefficients
+from quad_stream import solve_file, OUTPUT_DTYPE, QUAD_PARSE_ERROR
+import cbr_rates
+from cbr_rates import get_currencies
+from rates_cache import RatesCache, ValidatorStore, SingleFlight
+from cbr_client import CbrClient
+import cbr_rates_async
+from cbr_rates_async import get_currencies_async, get_currencies_many
+from cbr_history import get_currencies_range
+from rate_table import RateTable
+from stale_rates import StaleRates
+from cbr_stub_server import CbrStubServer
+
+
+_LOG_DIR = None
+_SAVED_LOG_FILE = None
+
+
+def setUpModule():
+    # Тесты пишут в свой временный лог, а не в currency.log в рабочем каталоге
+    global _LOG_DIR, _SAVED_LOG_FILE
+    _LOG_DIR = tempfile.mkdtemp()
+    _SAVED_LOG_FILE = os.environ.get("LOGTOOLS_FILE")
+    os.environ["LOGTOOLS_FILE"] = os.path.join(_LOG_DIR, "tests.log")
+    logtools.setup_file_logger()
+
+
+def tearDownModule():
+    logtools.file_handler.close()
+    shutil.rmtree(_LOG_DIR, ignore_errors=True)
+
+    # Возвращаем окружение и логгер в исходное состояние для остального процесса
+    if _SAVED_LOG_FILE is None:
+        os.environ.pop("LOGTOOLS_FILE", None)
+    else:
+        os.environ["LOGTOOLS_FILE"] = _SAVED_LOG_FILE
+    logtools.setup_file_logger()
+
+
+SAMPLE_VALUTE = {
+    "USD": {"CharCode": "USD", "Nominal": 1, "Value": 93.25},
+    "EUR": {"CharCode": "EUR", "Nominal": 1, "Value": 101.7},
+}
+
+
+def fake_response(valute=SAMPLE_VALUTE):
+    """Подменный ответ requests.get с заданным "Valute"."""
+    response = mock.Mock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {"Valute": valute}
+    response.status_code = 200
+    response.headers = {}
+    return response
 
 
 class TestTraceDecorator(unittest.TestCase):
@@ -38,6 +118,441 @@ class TestTraceDecorator(unittest.TestCase):
         self.assertIn("ERROR: Ошибка в bad: ValueError: ошибка!", log_content)
 
 
+class CountingRepr:
+    """Аргумент, который считает вызовы repr()."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "CountingRepr()"
+
+
+class TestTraceFastPath(unittest.TestCase):
+
+    def tearDown(self):
+        logtools.set_enabled(True)
+
+    def test_disabled_logger_skips_repr(self):
+        logger = logging.getLogger("test_trace_quiet")
+        logger.setLevel(logging.WARNING)
+        arg = CountingRepr()
+
+        @trace(handle=logger)
+        def identity(x):
+            return x
+
+        self.assertIs(identity(arg), arg)
+        self.assertEqual(arg.calls, 0)
+
+    def test_global_switch(self):
+        log = StringIO()
+        arg = CountingRepr()
+
+        @trace(handle=log)
+        def identity(x):
+            return x
+
+        logtools.set_enabled(False)
+        identity(arg)
+        self.assertEqual(log.getvalue(), "")
+        self.assertEqual(arg.calls, 0)
+
+        logtools.set_enabled(True)
+        identity(arg)
+        self.assertIn("INFO: Запуск identity(CountingRepr())", log.getvalue())
+
+    def test_errors_logged_when_info_disabled(self):
+        logger = logging.getLogger("test_trace_errors_only")
+        logger.setLevel(logging.ERROR)
+
+        @trace(handle=logger)
+        def bad():
+            raise ValueError("ошибка!")
+
+        with self.assertLogs(logger, level="ERROR") as logs:
+            with self.assertRaises(ValueError):
+                bad()
+        self.assertEqual(len(logs.output), 1)
+
+
+class TestTraceAsyncAndGenerators(unittest.IsolatedAsyncioTestCase):
+
+    async def test_coroutine_result_is_logged_after_await(self):
+        log = StringIO()
+
+        @trace(handle=log)
+        async def slow_add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        self.assertTrue(asyncio.iscoroutinefunction(slow_add))
+        self.assertEqual(await slow_add(2, 3), 5)
+        self.assertIn("INFO: slow_add вернула 5", log.getvalue())
+        self.assertNotIn("coroutine", log.getvalue())
+
+    async def test_coroutine_error(self):
+        log = StringIO()
+
+        @trace(handle=log)
+        async def bad():
+            raise ValueError("ошибка!")
+
+        with self.assertRaises(ValueError):
+            await bad()
+        self.assertIn("ERROR: Ошибка в bad: ValueError: ошибка!", log.getvalue())
+
+    def test_generator_counts_items(self):
+        log = StringIO()
+
+        @trace(handle=log)
+        def count_to(n):
+            yield from range(n)
+            return "готово"
+
+        gen = count_to(3)
+        self.assertNotIn("выдала", log.getvalue())
+        self.assertEqual(list(gen), [0, 1, 2])
+        self.assertIn("INFO: count_to выдала 3 элементов", log.getvalue())
+
+    def test_generator_send_and_close(self):
+        log = StringIO()
+
+        @trace(handle=log)
+        def echo():
+            received = None
+            while True:
+                received = yield received
+
+        gen = echo()
+        next(gen)
+        self.assertEqual(gen.send("x"), "x")
+        gen.close()
+        self.assertIn("INFO: echo закрыта после 2 элементов", log.getvalue())
+
+    async def test_async_generator(self):
+        log = StringIO()
+
+        @trace(handle=log)
+        async def ticks(n):
+            for i in range(n):
+                await asyncio.sleep(0)
+                yield i
+            raise KeyError("конец")
+
+        items = []
+        with self.assertRaises(KeyError):
+            async for item in ticks(2):
+                items.append(item)
+
+        self.assertEqual(items, [0, 1])
+        self.assertIn("ERROR: Ошибка в ticks: KeyError", log.getvalue())
+
+
+class SlowStream(StringIO):
+    """Поток, запись в который занимает время."""
+
+    def write(self, text):
+        time.sleep(0.05)
+        return super().write(text)
+
+
+class TestQueuedSink(unittest.TestCase):
+
+    def test_trace_accepts_sink_and_close_flushes(self):
+        with tempfile.TemporaryDirectory() as path:
+            log_path = os.path.join(path, "trace.log")
+            sink = QueuedSink(log_path, flush_interval=10)
+
+            @trace(handle=sink)
+            def add(a, b):
+                return a + b
+
+            for i in range(100):
+                add(i, 1)
+            sink.close()
+
+            with open(log_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(lines[0], "INFO: Запуск add(0, 1)")
+
+    def test_caller_does_not_wait_for_io(self):
+        stream = SlowStream()
+        sink = QueuedSink(stream, batch_size=1000, flush_interval=0)
+        started = time.perf_counter()
+        for _ in range(20):
+            sink.write("x\n")
+        self.assertLess(time.perf_counter() - started, 0.05)
+        sink.flush()
+        self.assertEqual(stream.getvalue(), "x\n" * 20)
+        sink.close()
+
+    def test_drop_policy_counts_dropped(self):
+        stream = SlowStream()
+        sink = QueuedSink(stream, maxsize=1, batch_size=1, policy="drop")
+        for _ in range(50):
+            sink.write("x\n")
+        sink.close()
+        self.assertGreater(sink.dropped, 0)
+        self.assertEqual(sink.written + sink.dropped, 50)
+
+    def test_write_after_close(self):
+        sink = QueuedSink(StringIO())
+        sink.close()
+        with self.assertRaises(ValueError):
+            sink.write("x")
+
+
+class TestTraceMetrics(unittest.TestCase):
+
+    def test_aggregates_calls_and_errors(self):
+        registry = MetricsRegistry()
+        log = StringIO()
+
+        @trace(handle=log, metrics=registry)
+        def maybe_fail(x):
+            if x < 0:
+                raise ValueError("отрицательное")
+            return x
+
+        for x in (1, 2, 3, -1):
+            try:
+                maybe_fail(x)
+            except ValueError:
+                pass
+
+        data = registry.as_dict()[maybe_fail.__module__ + ".TestTraceMetrics." +
+                                  "test_aggregates_calls_and_errors.<locals>.maybe_fail"]
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(data["errors"], 1)
+        self.assertLessEqual(data["min"], data["p50"])
+        self.assertLessEqual(data["p99"], data["max"])
+        self.assertRegex(log.getvalue(), r"maybe_fail вернула 1 за \d+\.\d{3} мс")
+
+    def test_prometheus_export(self):
+        registry = MetricsRegistry()
+
+        @trace(handle=StringIO(), metrics=registry)
+        def noop():
+            return None
+
+        noop()
+        text = registry.to_prometheus()
+        self.assertIn("# TYPE trace_duration_seconds histogram", text)
+        self.assertRegex(text, r'trace_calls_total\{function="[^"]*noop"\} 1')
+        self.assertRegex(text, r'trace_duration_seconds_bucket\{function="[^"]*noop",le="\+Inf"\} 1')
+
+    def test_no_metrics_keeps_plain_format(self):
+        log = StringIO()
+
+        @trace(handle=log)
+        def one():
+            return 1
+
+        one()
+        self.assertTrue(log.getvalue().endswith("INFO: one вернула 1\n"))
+
+
+class TestTraceSampling(unittest.TestCase):
+
+    def test_one_in_n(self):
+        log = StringIO()
+        arg = CountingRepr()
+
+        @trace(handle=log, sample_every=10)
+        def identity(x):
+            return x
+
+        for _ in range(2000):
+            identity(arg)
+
+        logged = log.getvalue().count("Запуск identity")
+        self.assertEqual(arg.calls, 2 * logged)  # repr аргумента и результата
+        self.assertTrue(100 < logged < 320, logged)
+        self.assertEqual(identity.sampler.sampled, logged)
+
+    def test_rate_limit_burst(self):
+        log = StringIO()
+
+        @trace(handle=log, rate_limit=0.001, burst=5)
+        def noop():
+            return None
+
+        for _ in range(100):
+            noop()
+        self.assertEqual(log.getvalue().count("Запуск noop"), 5)
+
+    def test_errors_logged_even_when_skipped(self):
+        log = StringIO()
+
+        @trace(handle=log, rate_limit=0.001, burst=1)
+        def bad():
+            raise ValueError("ошибка!")
+
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                bad()
+        self.assertEqual(log.getvalue().count("ERROR: Ошибка в bad"), 3)
+        self.assertEqual(log.getvalue().count("Запуск bad"), 1)
+
+    def test_errors_can_be_sampled_too(self):
+        log = StringIO()
+
+        @trace(handle=log, rate_limit=0.001, burst=1, always_log_errors=False)
+        def bad():
+            raise ValueError("ошибка!")
+
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                bad()
+        self.assertEqual(log.getvalue().count("ERROR: Ошибка в bad"), 1)
+
+    def test_sampler_validation(self):
+        with self.assertRaises(ValueError):
+            Sampler(every=0)
+
+
+class TestBoundedRenderer(unittest.TestCase):
+
+    def test_small_values_match_repr(self):
+        for value in (1, "abc", [1, 2], (1,), {"USD": 100.0}, {1, 2}, None, ()):
+            self.assertEqual(bounded_repr(value), repr(value))
+
+    def test_large_collections_are_cut(self):
+        render = BoundedRenderer(max_length=80, max_items=3)
+        self.assertEqual(render(list(range(10 ** 6))), "[0, 1, 2, …(+999997)]")
+        self.assertLessEqual(len(render({str(i): i for i in range(10 ** 5)})), 80)
+        self.assertLessEqual(len(render("x" * 10 ** 6)), 80)
+
+    def test_depth_limit(self):
+        render = BoundedRenderer(max_depth=2)
+        self.assertEqual(render([[[1]]]), "[[[…]]]")
+
+    def test_ndarray_summary(self):
+        self.assertEqual(bounded_repr(np.zeros((1000, 3))),
+                         "ndarray(shape=(1000, 3), dtype=float64)")
+
+    def test_trace_uses_renderer(self):
+        log = StringIO()
+
+        @trace(handle=log, render=BoundedRenderer(max_items=2))
+        def total(values):
+            return sum(values)
+
+        total(list(range(100)))
+        self.assertIn("INFO: Запуск total([0, 1, …(+98)])", log.getvalue())
+
+
+class TestStructuredTrace(unittest.TestCase):
+
+    def write_trace(self, sink_class, path):
+        with sink_class(path, buffer_size=256) as sink:
+            @trace(handle=sink)
+            def div(a, b):
+                return a / b
+
+            @trace(handle=sink)
+            def squares(n):
+                for i in range(n):
+                    yield i * i
+
+            for i in range(1, 21):
+                div(i, 2)
+            with self.assertRaises(ZeroDivisionError):
+                div(1, 0)
+            list(squares(3))
+
+    def check_records(self, path):
+        records = list(iter_records(path))
+        self.assertEqual(len(records), 22)
+        self.assertEqual(records[0]["fn"], "div")
+        self.assertEqual(records[0]["args"], "1, 2")
+        self.assertEqual(records[0]["result"], "0.5")
+        self.assertEqual(records[0]["outcome"], "ok")
+        self.assertGreaterEqual(records[0]["duration"], 0)
+        self.assertEqual(records[20]["outcome"], "error")
+        self.assertEqual(records[20]["error"], "ZeroDivisionError: division by zero")
+        self.assertEqual(records[21]["items"], 3)
+
+        summary = summarize(path).as_dict()
+        self.assertEqual(summary["div"]["count"], 21)
+        self.assertEqual(summary["div"]["errors"], 1)
+
+    def test_jsonl_roundtrip(self):
+        with tempfile.TemporaryDirectory() as path:
+            log_path = os.path.join(path, "trace.jsonl")
+            self.write_trace(JsonlSink, log_path)
+            self.check_records(log_path)
+
+    def test_binary_roundtrip_and_append(self):
+        with tempfile.TemporaryDirectory() as path:
+            log_path = os.path.join(path, "trace.bin")
+            self.write_trace(BinarySink, log_path)
+            self.check_records(log_path)
+
+            self.write_trace(BinarySink, log_path)
+            self.assertEqual(len(list(iter_records(log_path))), 44)
+
+    def test_base_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            _BufferedSink(StringIO(), 1024)
+
+
+class TestLazyFileLogger(unittest.TestCase):
+
+    def tearDown(self):
+        logtools.setup_file_logger()
+
+    def test_import_time_limits(self):
+        row = {"median_ms": 120.0, "min_ms": 95.0, "created_files": []}
+        results = {"solver_quad": row, "cbr_rates": dict(row, created_files=["currency.log"])}
+
+        problems = bench_import.check_limits(results, {"solver_quad": 80.0})
+
+        self.assertEqual(len(problems), 2)
+        self.assertIn("solver_quad", problems[0])
+        self.assertIn("currency.log", problems[1])
+        self.assertEqual(len(bench_import.check_limits(results, {"solver_quad": 100.0})), 1)
+
+    def test_import_creates_no_files(self):
+        result = bench_import.run(["cbr_rates", "solver_quad"], runs=1)
+        self.assertEqual(result["cbr_rates"]["created_files"], [])
+        self.assertEqual(result["solver_quad"]["created_files"], [])
+
+    def test_file_opened_on_first_record(self):
+        with tempfile.TemporaryDirectory() as path:
+            log_path = os.path.join(path, "lazy.log")
+            logtools.setup_file_logger(log_path)
+            self.assertFalse(os.path.exists(log_path))
+
+            logtools.file_logger.info("первая запись")
+            logtools.file_handler.close()
+            with open(log_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "INFO: первая запись\n")
+
+    def test_level_and_disable(self):
+        logtools.setup_file_logger(os.path.join(_LOG_DIR, "level.log"), level="error")
+        self.assertFalse(logtools.file_logger.isEnabledFor(logging.INFO))
+        self.assertTrue(logtools.file_logger.isEnabledFor(logging.ERROR))
+
+    def test_disabled_file_logs_nothing(self):
+        logtools.setup_file_logger("")
+        self.assertFalse(logtools.file_logger.isEnabledFor(logging.ERROR))
+
+        @trace(handle=logtools.file_logger)
+        def fail(value):
+            raise ValueError("ошибка")
+
+        argument = CountingRepr()
+        with mock.patch("sys.stderr", new_callable=StringIO) as stderr:
+            with self.assertRaises(ValueError):
+                fail(argument)
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertEqual(argument.calls, 0)
+
+
 class TestStringIOLogging(unittest.TestCase):
 
     def test_logging_stringio(self):
@@ -74,6 +589,713 @@ class TestQuadraticSolver(unittest.TestCase):
         with self.assertRaises(TypeError):
             solve_quadratic("abc", 1, 1)
 
+    def test_import_does_not_load_numpy(self):
+        """Скалярный решатель не платит за импорт numpy — он нужен только пакетному."""
+        code = "import sys, solver_quad; print('numpy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], cwd=bench_import.HERE,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+class TestRatesCache(unittest.TestCase):
+
+    def test_hit_skips_network(self):
+        cache = RatesCache(ttl=60)
+        with mock.patch("cbr_rates.requests.get", return_value=fake_response()) as get:
+            self.assertEqual(get_currencies(["USD"], cache=cache), {"USD": 93.25})
+            self.assertEqual(get_currencies(["EUR"], cache=cache), {"EUR": 101.7})
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_expired_entry_is_miss(self):
+        cache = RatesCache(ttl=60)
+        cache.put("u", SAMPLE_VALUTE)
+        with mock.patch("rates_cache.time.time", return_value=10 ** 12):
+            self.assertIsNone(cache.get("u"))
+
+    def test_lru_eviction(self):
+        cache = RatesCache(maxsize=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as path:
+            RatesCache(path=path).put("u", SAMPLE_VALUTE)
+            cache = RatesCache(path=path)
+            self.assertEqual(cache.get("u"), SAMPLE_VALUTE)
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_disk_tier_is_json(self):
+        with tempfile.TemporaryDirectory() as path:
+            RatesCache(path=path).put("u", SAMPLE_VALUTE)
+            (name,) = os.listdir(path)
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["valute"], SAMPLE_VALUTE)
+
+            # Повреждённый или чужой файл — просто промах
+            with open(os.path.join(path, name), "wb") as f:
+                f.write(b"\x80\x04K\x01.")
+            self.assertIsNone(RatesCache(path=path).get("u"))
+
+    def test_disk_read_outside_lock(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = RatesCache(path=path)
+            locked = []
+            original = cache._read_disk
+
+            def read_disk(url):
+                locked.append(cache._lock.locked())
+                return original(url)
+
+            cache._read_disk = read_disk
+            cache.get("u")
+            self.assertEqual(locked, [False])
+
+
+class TestCbrClient(unittest.TestCase):
+
+    def test_get_currencies_uses_client(self):
+        client = CbrClient(pool_size=4)
+        with mock.patch.object(client, "get", return_value=fake_response()) as get, \
+                mock.patch("cbr_rates.requests.get") as plain_get:
+            self.assertEqual(get_currencies(["USD"], client=client), {"USD": 93.25})
+        get.assert_called_once()
+        plain_get.assert_not_called()
+
+    def test_session_is_shared_between_threads(self):
+        with CbrClient(pool_size=8) as client:
+            first = client.session
+            self.assertIs(client.session, first)
+
+            other = []
+            thread = threading.Thread(target=lambda: other.append(client.session))
+            thread.start()
+            thread.join()
+            self.assertIs(other[0], first)
+            self.assertEqual(first.get_adapter("https://x")._pool_maxsize, 8)
+
+    def test_concurrent_requests_use_pool(self):
+        # Параллельные запросы из 4 потоков идут по разным соединениям пула
+        with CbrStubServer(size=10, latency=0.2) as server, CbrClient(pool_size=4) as client:
+            threads = [threading.Thread(target=lambda: client.get(server.url)) for _ in range(4)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertLess(time.perf_counter() - started, 0.6)
+
+    def test_network_error_becomes_connection_error(self):
+        client = CbrClient(retries=0)
+        error = requests.exceptions.ConnectionError("down")
+        with mock.patch.object(client, "get", side_effect=error):
+            with self.assertRaises(ConnectionError):
+                get_currencies(["USD"], client=client)
+
+
+class TestAsyncCurrencies(unittest.IsolatedAsyncioTestCase):
+
+    async def test_many_respects_limit_and_order(self):
+        active = 0
+        peak = 0
+
+        async def fake_fetch(session, url, timeout):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"USD": {"Value": float(url)}}
+
+        with mock.patch.object(cbr_rates_async, "_fetch_valute_async", fake_fetch):
+            result = await get_currencies_many(["USD"], ["1", "2", "3", "4", "5"], limit=2)
+
+        self.assertEqual([r["USD"] for r in result], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(peak, 2)
+
+    async def test_many_cancels_pending_on_error(self):
+        finished = []
+        cancelled = []
+
+        async def fake_fetch(session, url, timeout):
+            if url == "bad":
+                raise ConnectionError("down")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            finished.append(url)
+            return SAMPLE_VALUTE
+
+        with mock.patch.object(cbr_rates_async, "_fetch_valute_async", fake_fetch):
+            with self.assertRaises(ConnectionError):
+                await get_currencies_many(["USD"], ["1", "bad", "2"], limit=3)
+
+        # К возврату из get_currencies_many остальные запросы уже отменены
+        self.assertEqual(sorted(cancelled), ["1", "2"])
+        self.assertEqual(finished, [])
+
+    async def test_missing_currency_raises_key_error(self):
+        async def fake_fetch(session, url, timeout):
+            return SAMPLE_VALUTE
+
+        with mock.patch.object(cbr_rates_async, "_fetch_valute_async", fake_fetch):
+            with self.assertRaises(KeyError):
+                await get_currencies_async(["GBP"])
+
+    async def test_unreachable_url_raises_connection_error(self):
+        with self.assertRaises(ConnectionError):
+            await get_currencies_async(["USD"], url="http://127.0.0.1:9/", timeout=1)
+
+
+class TestRatesHistory(unittest.TestCase):
+
+    def fake_get(self, url, headers=None):
+        self.requested.append(url)
+        if url.endswith("/06/daily_json.js"):  # выходной — 404
+            response = mock.Mock(status_code=404)
+            return response
+        day = int(url.split("/")[-2])
+        response = fake_response({"USD": {"Value": 90.0 + day}, "EUR": {"Value": 100.0 + day}})
+        return response
+
+    def setUp(self):
+        self.requested = []
+        self.client = CbrClient()
+        self.client.get = self.fake_get
+
+    def test_range_table_and_no_refetch(self):
+        start, end = datetime.date(2024, 1, 4), datetime.date(2024, 1, 7)
+        with tempfile.TemporaryDirectory() as path:
+            dates, rates = get_currencies_range(["EUR", "USD"], start, end, path,
+                                                workers=2, client=self.client)
+            self.assertEqual(len(dates), 4)
+            self.assertEqual(rates.shape, (4, 2))
+            self.assertEqual(rates[0].tolist(), [104.0, 94.0])
+            self.assertTrue(all(r != r for r in rates[2]))  # NaN за выходной
+            self.assertEqual(len(self.requested), 4)
+
+            self.requested.clear()
+            get_currencies_range(["USD"], start, datetime.date(2024, 1, 8), path,
+                                 client=self.client)
+            self.assertEqual(len(self.requested), 1)
+
+    def test_open_day_without_data_is_retried(self):
+        day = datetime.date(2024, 1, 6)  # 404
+        with tempfile.TemporaryDirectory() as path, \
+                mock.patch("cbr_history._today", return_value=day):
+            dates, _ = get_currencies_range(["USD"], datetime.date(2024, 1, 5), day, path,
+                                            client=self.client)
+            self.assertEqual(len(dates), 1)
+
+            self.requested.clear()
+            get_currencies_range(["USD"], datetime.date(2024, 1, 5), day, path,
+                                 client=self.client)
+            self.assertEqual(len(self.requested), 1)
+
+    def test_datetime_bounds(self):
+        start = datetime.datetime(2024, 1, 4, 12, 30)
+        with tempfile.TemporaryDirectory() as path:
+            get_currencies_range(["USD"], start, start, path, client=self.client)
+            self.requested.clear()
+            dates, _ = get_currencies_range(["USD"], start, start, path, client=self.client)
+            self.assertEqual(self.requested, [])
+            self.assertEqual(len(dates), 1)
+
+    def test_unknown_currency(self):
+        day = datetime.date(2024, 1, 4)
+        with tempfile.TemporaryDirectory() as path:
+            with self.assertRaises(KeyError):
+                get_currencies_range(["XXX"], day, day, path, client=self.client)
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def test_304_reuses_parsed_payload(self):
+        validators = ValidatorStore()
+        first = fake_response()
+        first.headers = {"ETag": '"abc"'}
+        second = mock.Mock(status_code=304)
+        second.raise_for_status.return_value = None
+
+        with mock.patch("cbr_rates.requests.get", side_effect=[first, second]) as get:
+            get_currencies(["USD"], validators=validators)
+            self.assertEqual(get_currencies(["USD"], validators=validators), {"USD": 93.25})
+
+        self.assertEqual(get.call_args_list[1].kwargs["headers"], {"If-None-Match": '"abc"'})
+        second.json.assert_not_called()
+        self.assertEqual(validators.stats()["not_modified"], 1)
+
+    def test_no_validators_means_unconditional(self):
+        with mock.patch("cbr_rates.requests.get", return_value=fake_response()) as get:
+            get_currencies(["USD"])
+        self.assertIsNone(get.call_args.kwargs["headers"])
+
+
+class TestRateTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = RateTable.from_valute({
+            "USD": {"Nominal": 1, "Value": 90.0},
+            "EUR": {"Nominal": 1, "Value": 100.0},
+            "JPY": {"Nominal": 100, "Value": 60.0},
+        })
+
+    def test_nominal_is_applied(self):
+        self.assertAlmostEqual(self.table.rate("JPY", "RUB"), 0.6)
+
+    def test_vectorized_convert(self):
+        result = self.table.convert([1, 10, 100], ["USD", "EUR", "JPY"], "RUB")
+        np.testing.assert_allclose(result, [90.0, 1000.0, 60.0])
+
+        result = self.table.convert(np.array([90.0, 100.0]), "RUB", np.array(["USD", "EUR"]))
+        np.testing.assert_allclose(result, [1.0, 1.0])
+
+    def test_unknown_code(self):
+        with self.assertRaises(KeyError):
+            self.table.convert([1.0], ["GBP"], "RUB")
+
+    def test_bad_value_type(self):
+        with self.assertRaises(TypeError):
+            RateTable.from_valute({"USD": {"Nominal": 1, "Value": "90"}})
+        with self.assertRaises(TypeError):
+            RateTable.from_valute({"USD": {"Nominal": "1", "Value": 90.0}})
+
+    def test_non_positive_nominal(self):
+        with self.assertRaises(ValueError):
+            RateTable.from_valute({"USD": {"Nominal": 0, "Value": 90.0}})
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def run_concurrently(self, target, count=8):
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_callers_share_one_fetch(self):
+        calls = []
+        results = []
+
+        def slow_get(url, headers=None, timeout=None):
+            calls.append(url)
+            time.sleep(0.1)
+            return fake_response()
+
+        with mock.patch("cbr_rates.requests.get", side_effect=slow_get):
+            self.run_concurrently(lambda: results.append(get_currencies(["USD"])))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"USD": 93.25}] * 8)
+
+    def test_each_cache_is_filled(self):
+        caches = [RatesCache(ttl=60) for _ in range(4)]
+        workers = iter(caches)
+        lock = threading.Lock()
+
+        def slow_get(url, headers=None, timeout=None):
+            time.sleep(0.1)
+            return fake_response()
+
+        def worker():
+            with lock:
+                cache = next(workers)
+            get_currencies(["USD"], cache=cache)
+
+        with mock.patch("cbr_rates.requests.get", side_effect=slow_get):
+            self.run_concurrently(worker, count=4)
+
+        for cache in caches:
+            self.assertEqual(cache.get(cbr_rates.DEFAULT_URL), SAMPLE_VALUTE)
+
+    def test_cache_rechecked_before_fetch(self):
+        cache = RatesCache(ttl=60)
+        cache.put(cbr_rates.DEFAULT_URL, SAMPLE_VALUTE)
+        original_get = cache.get
+        # Первая проверка «опоздала»: запись появилась сразу после промаха
+        results = iter([None])
+        cache.get = lambda url, **kwargs: next(results, None) or original_get(url, **kwargs)
+
+        with mock.patch("cbr_rates.requests.get") as get:
+            self.assertEqual(get_currencies(["USD"], cache=cache), {"USD": 93.25})
+        get.assert_not_called()
+
+    def test_stale_rates_with_own_validators_fetch_separately(self):
+        """Два StaleRates с разными validators не разделяют один запрос по URL."""
+        stores = [ValidatorStore(), ValidatorStore()]
+        calls = []
+
+        def slow_get(url, headers=None, timeout=None):
+            calls.append(url)
+            time.sleep(0.1)
+            response = fake_response()
+            response.headers = {"ETag": '"v1"'}
+            return response
+
+        threads = [threading.Thread(target=StaleRates(validators=store).refresh)
+                   for store in stores]
+        with mock.patch("cbr_rates.requests.get", side_effect=slow_get):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 2)
+        for store in stores:
+            self.assertEqual(store.headers(cbr_rates.DEFAULT_URL), {"If-None-Match": '"v1"'})
+
+    def test_error_is_shared(self):
+        flight = SingleFlight()
+        errors = []
+
+        def failing():
+            time.sleep(0.1)
+            raise ConnectionError("down")
+
+        def worker():
+            try:
+                flight.do("u", failing)
+            except ConnectionError as exc:
+                errors.append(exc)
+
+        self.run_concurrently(worker, count=4)
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(flight.stats(), {"calls": 1, "shared": 3})
+
+
+class TestStaleRates(unittest.TestCase):
+
+    def test_serves_stale_and_refreshes_in_background(self):
+        rates = StaleRates(max_age=60)
+        newer = fake_response({"USD": {"Value": 95.0}})
+
+        with mock.patch("cbr_rates.requests.get", side_effect=[fake_response(), newer]):
+            self.assertEqual(rates.get(["USD"]), {"USD": 93.25})
+            rates._fetched_at -= 120  # снимок устарел
+
+            self.assertEqual(rates.get(["USD"]), {"USD": 93.25})
+            rates.wait()
+
+        self.assertEqual(rates.get(["USD"]), {"USD": 95.0})
+        self.assertLess(rates.age, 60)
+
+    def test_failed_refresh_keeps_snapshot(self):
+        rates = StaleRates(max_age=60)
+        down = requests.exceptions.ConnectionError("down")
+
+        with mock.patch("cbr_rates.requests.get", side_effect=[fake_response(), down]):
+            rates.get(["USD"])
+            rates._fetched_at -= 120
+            rates.get(["USD"])
+            rates.wait()
+
+            result, age = rates.get_with_age(["USD"])
+
+        self.assertEqual(result, {"USD": 93.25})
+        self.assertGreaterEqual(age, 120)
+        self.assertIsInstance(rates.last_error, ConnectionError)
+
+    def test_non_object_json_is_recorded(self):
+        """JSON null при фоновом обновлении не роняет поток, а записывается в last_error."""
+        rates = StaleRates(max_age=60, retry_interval=30)
+        broken = fake_response()
+        broken.json.return_value = None
+
+        with mock.patch("cbr_rates.requests.get", side_effect=[fake_response(), broken]):
+            rates.get(["USD"])
+            rates._fetched_at -= 120
+            rates.get(["USD"])
+            rates.wait()
+
+        self.assertIsInstance(rates.last_error, ValueError)
+        self.assertEqual(rates.failures, 1)
+        self.assertGreater(rates._next_attempt, time.monotonic())
+        self.assertEqual(rates.get(["USD"]), {"USD": 93.25})
+
+    def test_first_request_failure_raises(self):
+        down = requests.exceptions.ConnectionError("down")
+        with mock.patch("cbr_rates.requests.get", side_effect=down):
+            with self.assertRaises(ConnectionError):
+                StaleRates().get(["USD"])
+
+
+class TestStubServer(unittest.TestCase):
+
+    def test_get_currencies_against_stub(self):
+        with CbrStubServer(size=10) as server, CbrClient() as client:
+            rates = get_currencies(["USD", "EUR"], url=server.url, client=client)
+        self.assertEqual(set(rates), {"USD", "EUR"})
+
+    def test_conditional_get_gets_304(self):
+        validators = ValidatorStore()
+        with CbrStubServer() as server:
+            get_currencies(["USD"], url=server.url, validators=validators)
+            get_currencies(["USD"], url=server.url, validators=validators)
+        self.assertEqual(validators.stats()["not_modified"], 1)
+
+    def test_injected_failures(self):
+        with CbrStubServer(error_rate=1.0) as server:
+            with self.assertRaises(ConnectionError):
+                get_currencies(["USD"], url=server.url)
+        with CbrStubServer(malformed_rate=1.0) as server:
+            with self.assertRaises(ValueError):
+                get_currencies(["USD"], url=server.url)
+
+
+class TestQuadraticBatch(unittest.TestCase):
+
+    def test_matches_scalar_solver(self):
+        rng = np.random.default_rng(0)
+        a, b, c = rng.uniform(-10, 10, (3, 1000))
+        x1, x2, status = solve_quadratic_batch(a, b, c)
+
+        for i in range(len(a)):
+            if status[i] == QUAD_OK:
+                expected = solve_quadratic(float(a[i]), float(b[i]), float(c[i]))
+                np.testing.assert_allclose((x1[i], x2[i]), expected, rtol=1e-9, atol=1e-12)
+            else:
+                self.assertEqual(status[i], QUAD_NEGATIVE_DISCRIMINANT)
+                self.assertTrue(np.isnan(x1[i]) and np.isnan(x2[i]))
+
+    def test_status_mask(self):
+        x1, x2, status = solve_quadratic_batch([1, 0, 1, np.nan, 1], [-3, 2, 0, 1, 0],
+                                               [2, 3, 1, 1, 0])
+        self.assertEqual(status.tolist(), [QUAD_OK, QUAD_A_ZERO, QUAD_NEGATIVE_DISCRIMINANT,
+                                           QUAD_NOT_FINITE, QUAD_OK])
+        self.assertEqual((x1[0], x2[0]), (2.0, 1.0))
+        self.assertEqual((x1[4], x2[4]), (0.0, 0.0))
+
+    def test_complex_roots(self):
+        x1, x2, status = solve_quadratic_batch([1], [0], [1], complex_roots=True)
+        self.assertEqual(status[0], QUAD_NEGATIVE_DISCRIMINANT)
+        np.testing.assert_allclose([x1[0], x2[0]], [1j, -1j])
+
+    def test_stable_for_small_root(self):
+        x1, x2, _ = solve_quadratic_batch(1.0, 1e8, 1.0)
+        self.assertAlmostEqual(x1[()] * 1e8, -1.0, places=12)
+
+    def test_no_overflow_in_discriminant(self):
+        with np.errstate(all="raise"):
+            x1, x2, status = solve_quadratic_batch([1.0, 1e-300, 1e-310], [3e154, 1, 1],
+                                                   [1.0, 1e300, -1])
+        self.assertEqual(status.tolist(), [QUAD_OK, QUAD_NEGATIVE_DISCRIMINANT, QUAD_OVERFLOW])
+        self.assertAlmostEqual(x1[0] * 3e154, -1.0, places=12)
+        self.assertAlmostEqual(x2[0] / 3e154, -1.0, places=12)
+        self.assertTrue(np.isnan(x1[2]) and np.isnan(x2[2]))
+
+
+class TestQuadraticCache(unittest.TestCase):
+
+    def test_hits_skip_solver_and_trace(self):
+        stream = StringIO()
+        traced = trace(solve_quadratic.__wrapped__, handle=stream)
+        cache = QuadraticCache(maxsize=8, solver=traced)
+
+        self.assertEqual(cache(1, -3, 2), (2.0, 1.0))
+        logged = stream.getvalue()
+        self.assertEqual(cache(1.0, -3.0, 2.0), (2.0, 1.0))
+        self.assertEqual(cache(1, -3.0, 2), (2.0, 1.0))
+
+        self.assertEqual(stream.getvalue(), logged)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_error_is_cached(self):
+        calls = []
+
+        def solver(a, b, c):
+            calls.append((a, b, c))
+            return solve_quadratic.__wrapped__(a, b, c)
+
+        cache = QuadraticCache(solver=solver)
+        for _ in range(3):
+            with self.assertRaisesRegex(ValueError, "Дискриминант"):
+                cache(1, 0, 1)
+        self.assertEqual(len(calls), 1)
+
+        # Нечисловые аргументы не кэшируются и дают обычный TypeError
+        with self.assertRaises(TypeError):
+            cache("1", 0, 1)
+        self.assertEqual(cache.stats()["uncached"], 1)
+
+    def test_lru_eviction(self):
+        cache = QuadraticCache(maxsize=2, solver=solve_quadratic.__wrapped__)
+        cache(1, -3, 2)
+        cache(1, -5, 6)
+        cache(1, -3, 2)      # освежает первую запись
+        cache(1, -7, 12)     # вытесняет (1, -5, 6)
+        cache(1, -5, 6)
+        self.assertEqual(cache.stats()["evictions"], 2)
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_thread_safety(self):
+        cache = QuadraticCache(maxsize=16, solver=solve_quadratic.__wrapped__)
+
+        def worker():
+            for i in range(500):
+                self.assertEqual(cache(1, -(i % 32 + 2), i % 32 + 1), (i % 32 + 1, 1.0))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 2000)
+        self.assertLessEqual(stats["size"], 16)
+
+
+class TestPolyBatch(unittest.TestCase):
+
+    def test_matches_numpy_roots(self):
+        c = make_coefficients(400, seed=1)
+        roots, degree, status = solve_poly_batch(c, complex_roots=True)
+
+        self.assertTrue((status == POLY_OK).all())
+        for i in range(len(c)):
+            expected = np.roots(c[i])
+            found = roots[i, :degree[i]]
+            # Сопоставляем корни по ближайшему: порядок у формул и numpy.roots разный
+            distance = np.abs(found[:, None] - expected[None, :]).min(axis=1)
+            self.assertLess(distance.max(), 1e-8 * (1 + np.abs(expected).max()))
+            self.assertTrue(np.isnan(roots[i, degree[i]:]).all())
+
+    def test_real_mode_and_status(self):
+        roots, degree, status = solve_poly_batch([
+            [1, 0, -5, 0, 4],   # (x²-1)(x²-4)
+            [0, 0, 1, 0, 1],    # x² + 1
+            [0, 0, 0, 0, 3],    # константа
+            [0, 1, np.inf, 0, 0],
+            [0, 0, 0, 2, -1],   # 2x - 1
+        ])
+        self.assertEqual(degree.tolist(), [4, 2, 0, 3, 1])
+        self.assertEqual(status.tolist(), [POLY_OK, POLY_COMPLEX_ROOTS, POLY_CONSTANT,
+                                           POLY_NOT_FINITE, POLY_OK])
+        np.testing.assert_allclose(np.sort(roots[0]), [-2, -1, 1, 2])
+        self.assertTrue(np.isnan(roots[1]).all())
+        self.assertEqual(roots[4, 0], 0.5)
+
+    def test_multiple_root(self):
+        roots, _, status = solve_poly_batch([[1, -3, 3, -1]])  # (x-1)³
+        self.assertEqual(status[0], POLY_OK)
+        np.testing.assert_allclose(roots[0, :3], [1, 1, 1], atol=1e-4)
+
+    def test_wide_dynamic_range(self):
+        # Коэффициенты от 1e-3 до 1e3: корни сильно разных порядков
+        c = make_coefficients(3000, seed=2, spread=3)
+        roots, degree, _ = solve_poly_batch(c, complex_roots=True)
+        for i in range(len(c)):
+            expected = np.roots(c[i])
+            found = roots[i, :degree[i]]
+            error = np.abs(found[:, None] - expected[None, :]) / np.abs(expected)[None, :]
+            self.assertLess(error.min(axis=1).max(), 1e-6, c[i])
+
+    def test_known_widely_separated_roots(self):
+        # Один корень в 1e10–1e14 раз больше остальных: шаги Ньютона не должны
+        # стянуть малые корни в один, потеряв остальные
+        rng = np.random.default_rng(3)
+        rows, known = [], []
+        for big in (1e10, 1e14):
+            for _ in range(300):
+                degree = int(rng.integers(2, 5))
+                r = (rng.uniform(0.5, 3, degree) * rng.choice([-1, 1], degree)).astype(complex)
+                if degree >= 3:
+                    r[0] = complex(rng.uniform(-3, 3), rng.uniform(0.5, 3))
+                    r[1] = r[0].conjugate()
+                r[-1] = big * rng.choice([-1, 1])
+                c = np.zeros(5)
+                c[5 - degree - 1:] = np.real(np.poly(r))
+                rows.append(c)
+                known.append(r)
+
+        roots, degree, status = solve_poly_batch(np.array(rows), complex_roots=True)
+        self.assertTrue((status == POLY_OK).all())
+        for i, r in enumerate(known):
+            found = roots[i, :degree[i]]
+            error = np.abs(r[:, None] - found[None, :]) / np.abs(r)[:, None]
+            self.assertLess(error.min(axis=1).max(), 1e-5, (r, found))
+
+        roots, _, _ = solve_poly_batch([[1e-20, 1, 1, 1, 1]], complex_roots=True)
+        expected = np.array([-1e20, -1, 1j, -1j])
+        error = np.abs(expected[:, None] - roots[0][None, :]) / np.abs(expected)[:, None]
+        self.assertLess(error.min(axis=1).max(), 1e-6)
+
+    def test_ill_conditioned_rows(self):
+        roots, _, _ = solve_poly_batch([[1, 1e6, 1, 1, 1], [1e-8, 1, -3, 3, -1]], complex_roots=True)
+        for row, c in zip(roots, ([1, 1e6, 1, 1, 1], [1e-8, 1, -3, 3, -1])):
+            expected = np.roots(c)
+            error = np.abs(row[:, None] - expected[None, :]) / np.abs(expected)[None, :]
+            self.assertLess(error.min(axis=1).max(), 1e-6)
+
+
+class TestQuadStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_csv_keeps_order_and_marks_bad_rows(self):
+        rows = ["a,b,c"] + [f"1,{-(i + 2)},{i + 1}" for i in range(50)]  # корни 1 и i+1
+        rows[10] = "1,2"
+        rows[20] = "x,y,z"
+        rows[30] = "0,1,1"
+        with open(self.path("in.csv"), "w") as f:
+            f.write("\n".join(rows) + "\n")
+
+        progress = []
+        summary = solve_file(self.path("in.csv"), self.path("out.csv"), chunk_size=7,
+                             workers=2, max_pending=2, progress=progress.append)
+
+        self.assertEqual(summary["rows"], 50)
+        self.assertEqual(summary["parse_error"], 2)
+        self.assertEqual(summary["a_zero"], 1)
+        self.assertEqual(summary["ok"], 47)
+        self.assertEqual(progress[-1], 50)
+        self.assertEqual(progress, sorted(progress))
+
+        result = np.loadtxt(self.path("out.csv"), delimiter=",")
+        self.assertEqual(result.shape, (50, 3))
+        status = result[:, 2].astype(int)
+        self.assertEqual(status[9], QUAD_PARSE_ERROR)
+        self.assertEqual(status[19], QUAD_PARSE_ERROR)
+        self.assertEqual(status[29], QUAD_A_ZERO)
+        for i in (0, 25, 49):
+            self.assertEqual(status[i], QUAD_OK)
+            self.assertEqual(sorted(result[i, :2]), sorted([1.0, i + 1.0]))
+
+    def test_binary_roundtrip(self):
+        a, b, c = np.array([1.0, 1.0, 2.0]), np.array([-3.0, 0.0, 4.0]), np.array([2.0, 1.0, 2.0])
+        np.column_stack([a, b, c]).astype("<f8").tofile(self.path("in.bin"))
+
+        summary = solve_file(self.path("in.bin"), self.path("out.bin"), chunk_size=2, workers=1)
+        records = np.fromfile(self.path("out.bin"), dtype=OUTPUT_DTYPE)
+
+        self.assertEqual(summary["rows"], 3)
+        self.assertEqual(records["status"].tolist(),
+                         [QUAD_OK, QUAD_NEGATIVE_DISCRIMINANT, QUAD_OK])
+        x1, x2, _ = solve_quadratic_batch(a, b, c)
+        np.testing.assert_array_equal(records["x1"], x1)
+        np.testing.assert_array_equal(records["x2"], x2)
+
+    def test_truncated_binary_input(self):
+        with open(self.path("in.bin"), "wb") as f:
+            f.write(b"\0" * 30)
+        with self.assertRaises(ValueError):
+            solve_file(self.path("in.bin"), self.path("out.bin"), workers=1)
+
 
 if __name__ == "__main__":
     unittest.main()
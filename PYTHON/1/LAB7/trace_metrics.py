@@ -0,0 +1,158 @@
+import bisect
+import threading
+from typing import Dict, List, Optional, Any
+
+
+# Границы корзин гистограммы задержек, секунды (как принято у Prometheus)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class FunctionStats:
+    """
+    Агрегаты по одной функции: число вызовов и ошибок, суммарное,
+    минимальное и максимальное время, CPU-время и гистограмма задержек.
+    """
+
+    def __init__(self, name: str, buckets=DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # последняя — +Inf
+        self.count = 0
+        self.timed = 0
+        self.errors = 0
+        self.total = 0.0
+        self.cpu_total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wall: Optional[float], cpu: Optional[float] = None,
+               error: bool = False) -> None:
+        """
+        Учитывает один вызов: wall — секунды реального времени, cpu — CPU-время.
+        Если wall неизвестно (None), вызов учитывается только в count/errors.
+        """
+        with self._lock:
+            self.count += 1
+            if error:
+                self.errors += 1
+            if wall is None:
+                return
+            index = bisect.bisect_left(self.buckets, wall)
+            self.timed += 1
+            self.total += wall
+            if cpu is not None:
+                self.cpu_total += cpu
+            if wall < self.min:
+                self.min = wall
+            if wall > self.max:
+                self.max = wall
+            self.counts[index] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Оценка квантиля q (0..1) по гистограмме: верхняя граница корзины,
+        в которой набирается доля q вызовов (не больше max).
+        """
+        with self._lock:
+            if not self.timed:
+                return 0.0
+            target = q * self.timed
+            seen = 0
+            for bound, count in zip(self.buckets + (self.max,), self.counts):
+                seen += count
+                if seen >= target:
+                    return min(bound, self.max)
+            return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "count": self.count,
+                "timed": self.timed,
+                "errors": self.errors,
+                "total": self.total,
+                "cpu_total": self.cpu_total,
+                "min": self.min if self.timed else 0.0,
+                "max": self.max,
+                "mean": self.total / self.timed if self.timed else 0.0,
+                "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+            }
+        data["p50"] = self.percentile(0.50)
+        data["p90"] = self.percentile(0.90)
+        data["p99"] = self.percentile(0.99)
+        return data
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасный реестр FunctionStats по именам функций.
+
+    Пример:
+        registry = MetricsRegistry()
+
+        @trace(handle=log, metrics=registry)
+        def f(): ...
+
+        registry.as_dict()["module.f"]["p99"]
+        print(registry.to_prometheus())
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._stats: Dict[str, FunctionStats] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"MetricsRegistry(functions={len(self._stats)})"
+
+    def stats(self, name: str) -> FunctionStats:
+        """FunctionStats для имени (создаётся при первом обращении)."""
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, FunctionStats(name, self.buckets))
+        return stats
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Снимок всех агрегатов: {имя функции: {count, errors, total, ..., p99}}."""
+        return {name: self._stats[name].as_dict() for name in self.names()}
+
+    def to_prometheus(self, prefix: str = "trace") -> str:
+        """Снимок в текстовом формате экспозиции Prometheus."""
+        snapshot = self.as_dict()
+
+        def label(name: str) -> str:
+            return 'function="' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+        lines = []
+        for metric, field in (("calls_total", "count"), ("errors_total", "errors"),
+                              ("cpu_seconds_total", "cpu_total")):
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, data in snapshot.items():
+                lines.append(f"{prefix}_{metric}{{{label(name)}}} {data[field]!r}")
+
+        lines.append(f"# TYPE {prefix}_duration_seconds histogram")
+        for name, data in snapshot.items():
+            cumulative = 0
+            for bound, count in data["buckets"].items():
+                cumulative += count
+                lines.append(f'{prefix}_duration_seconds_bucket{{{label(name)},le="{bound}"}} '
+                             f'{cumulative}')
+            lines.append(f"{prefix}_duration_seconds_sum{{{label(name)}}} {data['total']!r}")
+            lines.append(f"{prefix}_duration_seconds_count{{{label(name)}}} {data['timed']}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Реестр по умолчанию для trace(metrics=True)
+default_registry = MetricsRegistry()
@@ -0,0 +1,237 @@
+"""
+Структурированный вывод trace и потоковое чтение трасс.
+
+Запись одного вызова — словарь:
+    fn       — имя функции
+    ts       — время начала (Unix time, секунды)
+    duration — длительность, секунды (None, если вызов не попал в выборку)
+    outcome  — "ok", "error" или "closed" (генератор закрыт досрочно)
+    args     — отображение аргументов
+    result   — отображение результата
+    items    — число элементов генератора
+    error    — "ТипОшибки: сообщение"
+
+Форматы файлов:
+    JSON Lines — по компактному JSON-объекту на строку
+    бинарный   — заголовок MAGIC, далее записи с префиксом длины
+
+Сводка по файлу любого размера в постоянной памяти:
+    python trace_records.py trace.jsonl
+"""
+import io
+import abc
+import json
+import math
+import atexit
+import struct
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from trace_metrics import MetricsRegistry
+
+
+MAGIC = b"TRB1"
+
+_LENGTH = struct.Struct("<I")
+_FIXED = struct.Struct("<ddBq")  # ts, duration, outcome, items
+_OUTCOMES = ("ok", "error", "closed")
+_STRINGS = ("fn", "args", "result", "error")
+
+
+class _BufferedSink(abc.ABC):
+    """
+    Общая часть приёмников: буфер в памяти, сброс по размеру и при закрытии.
+    Подкласс задаёт формат записи методом _encode.
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], buffer_size: int) -> None:
+        if buffer_size <= 0:
+            raise ValueError("buffer_size должен быть положительным")
+
+        if isinstance(target, str):
+            self._stream = open(target, "ab")
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+
+        self.buffer_size = buffer_size
+        self.records = 0
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+        if self._stream.tell() == 0:
+            self._start_file()
+        atexit.register(self.close)
+
+    def _start_file(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        """Кодирует одну запись в байты для файла."""
+
+    def emit_record(self, record: Dict[str, Any]) -> None:
+        """Добавляет запись в буфер; на диск буфер уходит при заполнении."""
+        data = self._encode(record)
+        with self._lock:
+            if self._closed:
+                raise ValueError("Запись в закрытый приёмник трасс")
+            self._buffer.append(data)
+            self._buffered += len(data)
+            self.records += 1
+            if self._buffered >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buffer:
+            self._stream.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._stream.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._closed = True
+        if self._owns_stream:
+            self._stream.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JsonlSink(_BufferedSink):
+    """
+    Приёмник trace в формате JSON Lines с буферизованной записью.
+
+    Параметры:
+        target      : путь к файлу (дозапись) или бинарный поток
+        buffer_size : размер буфера в байтах, после которого он сбрасывается
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], buffer_size: int = 64 * 1024) -> None:
+        super().__init__(target, buffer_size)
+
+    def __repr__(self) -> str:
+        return f"JsonlSink(buffer_size={self.buffer_size})"
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class BinarySink(_BufferedSink):
+    """
+    Приёмник trace в компактном бинарном формате.
+
+    Запись: длина тела (uint32), затем ts и duration (float64, NaN — нет),
+    outcome (uint8), items (int64, -1 — нет) и строки fn, args, result,
+    error — каждая с префиксом длины (uint32, 0xFFFFFFFF — None).
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], buffer_size: int = 64 * 1024) -> None:
+        super().__init__(target, buffer_size)
+
+    def __repr__(self) -> str:
+        return f"BinarySink(buffer_size={self.buffer_size})"
+
+    def _start_file(self) -> None:
+        self._stream.write(MAGIC)
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        duration = record["duration"]
+        items = record["items"]
+        parts = [_FIXED.pack(record["ts"], math.nan if duration is None else duration,
+                             _OUTCOMES.index(record["outcome"]),
+                             -1 if items is None else items)]
+        for key in _STRINGS:
+            value = record[key]
+            if value is None:
+                parts.append(_LENGTH.pack(0xFFFFFFFF))
+            else:
+                data = value.encode("utf-8")
+                parts.append(_LENGTH.pack(len(data)))
+                parts.append(data)
+        body = b"".join(parts)
+        return _LENGTH.pack(len(body)) + body
+
+
+def _decode_binary(body: bytes) -> Dict[str, Any]:
+    ts, duration, outcome, items = _FIXED.unpack_from(body, 0)
+    record = {"ts": ts, "duration": None if math.isnan(duration) else duration,
+              "outcome": _OUTCOMES[outcome], "items": None if items < 0 else items}
+    offset = _FIXED.size
+    for key in _STRINGS:
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        if length == 0xFFFFFFFF:
+            record[key] = None
+        else:
+            record[key] = body[offset:offset + length].decode("utf-8")
+            offset += length
+    return record
+
+
+def iter_records(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Потоково читает записи из файла JSON Lines или бинарного формата
+    (определяется по заголовку). Память не зависит от размера файла.
+
+    ValueError — повреждённая запись.
+    """
+    with open(path, "rb", buffering=chunk_size) as f:
+        if f.peek(len(MAGIC))[:len(MAGIC)] == MAGIC:
+            f.read(len(MAGIC))
+            while True:
+                header = f.read(_LENGTH.size)
+                if not header:
+                    return
+                if len(header) < _LENGTH.size:
+                    raise ValueError("Обрезанная запись в бинарной трассе")
+                (length,) = _LENGTH.unpack(header)
+                body = f.read(length)
+                if len(body) < length:
+                    raise ValueError("Обрезанная запись в бинарной трассе")
+                yield _decode_binary(body)
+        else:
+            for line in io.TextIOWrapper(f, encoding="utf-8"):
+                if line.strip():
+                    yield json.loads(line)
+
+
+def summarize(path: str, registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Сводка по файлу трассы: для каждой функции число вызовов, ошибок,
+    суммарное/мин/макс время и квантили — в MetricsRegistry.
+    """
+    registry = registry or MetricsRegistry()
+    for record in iter_records(path):
+        registry.stats(record["fn"]).record(record["duration"],
+                                            error=record["outcome"] == "error")
+    return registry
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Использование: python trace_records.py <файл трассы>")
+        sys.exit(2)
+
+    print(f"{'функция':<30} {'вызовов':>9} {'ошибок':>7} {'сумма, с':>10} {'p50, мс':>9} {'p99, мс':>9}")
+    for fn, data in summarize(sys.argv[1]).as_dict().items():
+        print(f"{fn:<30} {data['count']:>9} {data['errors']:>7} {data['total']:>10.3f} "
+              f"{data['p50'] * 1000:>9.3f} {data['p99'] * 1000:>9.3f}")
@@ -0,0 +1,124 @@
+import itertools
+from typing import Any, List
+
+
+class BoundedRenderer:
+    """
+    Ограниченный repr() для логов trace.
+
+    Стоимость не зависит от размера значения:
+        • строки и байты обрезаются до max_length до вызова repr
+        • из списков, кортежей, множеств и словарей берутся только первые
+          max_items элементов, глубина вложенности — не больше max_depth
+        • массивы NumPy, тензоры и подобные объекты с shape/dtype
+          описываются формой и типом, DataFrame — формой и столбцами
+        • итоговая строка не длиннее max_length символов
+
+    Для небольших значений результат совпадает с обычным repr().
+
+    Параметры:
+        max_length : максимальная длина итоговой строки
+        max_items  : сколько элементов коллекции показывать
+        max_depth  : глубина вложенности коллекций
+    """
+
+    ELLIPSIS = "…"
+
+    def __init__(self, max_length: int = 200, max_items: int = 10, max_depth: int = 3) -> None:
+        if max_length < 8 or max_items < 1 or max_depth < 1:
+            raise ValueError("Слишком маленькие ограничения для отображения")
+        self.max_length = max_length
+        self.max_items = max_items
+        self.max_depth = max_depth
+
+    def __repr__(self) -> str:
+        return (f"BoundedRenderer(max_length={self.max_length}, "
+                f"max_items={self.max_items}, max_depth={self.max_depth})")
+
+    def __call__(self, value: Any) -> str:
+        text = self._render(value, self.max_depth)
+        if len(text) > self.max_length:
+            text = text[:self.max_length - 1] + self.ELLIPSIS
+        return text
+
+    def _render(self, value: Any, depth: int) -> str:
+        if value is None or isinstance(value, (bool, float, complex)):
+            return repr(value)
+
+        if isinstance(value, int):
+            # repr огромного int квадратичен по числу цифр
+            if value.bit_length() > 256:
+                return f"int({value.bit_length()} бит)"
+            return repr(value)
+
+        if isinstance(value, (str, bytes, bytearray)):
+            if len(value) <= self.max_length:
+                return repr(value)
+            return f"{value[:self.max_length]!r}{self.ELLIPSIS}(len={len(value)})"
+
+        summary = self._summary(value)
+        if summary is not None:
+            return summary
+
+        if isinstance(value, dict):
+            return self._render_items(value, depth, "{", "}",
+                                      ((k, v) for k, v in value.items()), mapping=True)
+        if isinstance(value, list):
+            return self._render_items(value, depth, "[", "]", iter(value))
+        if isinstance(value, tuple):
+            if len(value) == 1:
+                return self._render_items(value, depth, "(", ",)", iter(value))
+            return self._render_items(value, depth, "(", ")", iter(value))
+        if isinstance(value, (set, frozenset)):
+            if not value:
+                return f"{type(value).__name__}()"
+            text = self._render_items(value, depth, "{", "}", iter(value))
+            return text if isinstance(value, set) else f"frozenset({text})"
+
+        return repr(value)
+
+    @staticmethod
+    def _summary(value: Any) -> Any:
+        """Краткое описание массивов и таблиц (numpy, pandas, torch) без их обхода."""
+        shape = getattr(value, "shape", None)
+        if not isinstance(shape, tuple):
+            return None
+
+        name = type(value).__name__
+        columns = getattr(value, "columns", None)
+        if columns is not None:
+            head = [str(c) for c in itertools.islice(columns, 5)]
+            more = ", …" if len(columns) > 5 else ""
+            return f"{name}(shape={shape}, columns=[{', '.join(head)}{more}])"
+
+        dtype = getattr(value, "dtype", None)
+        if dtype is not None:
+            return f"{name}(shape={shape}, dtype={dtype})"
+        return f"{name}(shape={shape})"
+
+    def _render_items(self, container: Any, depth: int, opening: str, closing: str,
+                      items, mapping: bool = False) -> str:
+        if depth <= 0:
+            return f"{opening}{self.ELLIPSIS}{closing.lstrip(',')}"
+
+        parts: List[str] = []
+        length = 0
+        for item in itertools.islice(items, self.max_items):
+            if mapping:
+                key, val = item
+                part = f"{self._render(key, depth - 1)}: {self._render(val, depth - 1)}"
+            else:
+                part = self._render(item, depth - 1)
+            parts.append(part)
+            length += len(part) + 2
+            if length > self.max_length:
+                break
+
+        rest = len(container) - len(parts)
+        if rest > 0:
+            parts.append(f"{self.ELLIPSIS}(+{rest})")
+        return opening + ", ".join(parts) + closing
+
+
+# Отображение по умолчанию для trace(render=bounded_repr)
+bounded_repr = BoundedRenderer()
@@ -0,0 +1,68 @@
+import time
+import random
+import threading
+from typing import Optional
+
+
+class Sampler:
+    """
+    Решает, логировать ли очередной вызов trace.
+
+    Два независимых фильтра (вызов логируется, только если прошёл оба):
+        • every — вероятностная выборка «1 из N» (every=1 — логировать всё)
+        • rate  — ограничение скорости «маркерным ведром»: не больше rate
+                  вызовов в секунду в среднем и не больше burst подряд
+
+    Проверка every — один вызов random.random() без блокировок; блокировка
+    берётся только для ведра и только если вызов прошёл первый фильтр.
+    Счётчики sampled/skipped приблизительные (без блокировки).
+
+    Параметры:
+        every : логировать в среднем один вызов из every
+        rate  : максимум логируемых вызовов в секунду (None — без ограничения)
+        burst : размер ведра (по умолчанию max(1, rate))
+    """
+
+    def __init__(self, every: int = 1, rate: Optional[float] = None,
+                 burst: Optional[int] = None) -> None:
+        if every < 1:
+            raise ValueError("every должен быть не меньше 1")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate должен быть положительным")
+
+        self.every = every
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1.0, rate or 1.0))
+
+        self._threshold = 1.0 / every
+        self._random = random.random
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.sampled = 0
+        self.skipped = 0
+
+    def __repr__(self) -> str:
+        return f"Sampler(every={self.every}, rate={self.rate}, burst={self.capacity:g})"
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def should_log(self) -> bool:
+        """True — вызов нужно логировать, False — пропустить без форматирования."""
+        if self.every > 1 and self._random() >= self._threshold:
+            self.skipped += 1
+            return False
+        if self.rate is not None and not self._take_token():
+            self.skipped += 1
+            return False
+        self.sampled += 1
+        return True